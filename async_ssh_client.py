@@ -0,0 +1,189 @@
+"""
+Async SSH Client Implementation
+
+asyncio counterpart of ssh_client.SSHClient built on asyncssh, for fanning
+commands out to many hosts from one event loop. asyncssh is an optional
+dependency (pip install netconfig[async]) and is imported on first connect.
+"""
+
+import asyncio
+import logging
+import os
+from typing import Any, Awaitable, Optional, TypeVar
+
+from ssh_client import SSHClientError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class AsyncSSHClient:
+    """
+    Async SSH client for executing commands on remote hosts.
+
+    Takes the same connection settings as ssh_client.SSHClient, but
+    execute() is a coroutine. Concurrent execute() calls on one client
+    run on separate channels of the same connection, e.g.:
+
+        async with AsyncSSHClient("10.0.0.1") as ssh:
+            outputs = await asyncio.gather(*(ssh.execute(c) for c in cmds))
+    """
+
+    def __init__(
+        self,
+        hostname: str,
+        port: int = 22,
+        username: str = "root",
+        auth_type: str = "key",
+        key_file: Optional[str] = None,
+        password: Optional[str] = None,
+        timeout: int = 10
+    ):
+        """
+        Initialize async SSH client.
+
+        Args:
+            hostname: Remote host IP or hostname
+            port: SSH port (default: 22)
+            username: SSH username (default: root)
+            auth_type: Authentication type - "key" or "password"
+            key_file: Path to private key file (for key auth)
+            password: Password (for password auth)
+            timeout: Connection and command timeout in seconds
+        """
+        self.hostname = hostname
+        self.port = port
+        self.username = username
+        self.auth_type = auth_type
+        self.key_file = key_file
+        self.password = password
+        self.timeout = timeout
+
+        self._conn: Any = None
+        # Created on first use so it binds to the running event loop
+        self._connect_lock: Optional[asyncio.Lock] = None
+
+    async def connect(self) -> None:
+        """
+        Establish SSH connection to the remote host.
+
+        Raises:
+            SSHClientError: If asyncssh is missing or connection fails
+        """
+        if self._conn is not None:
+            return
+
+        try:
+            import asyncssh
+        except ImportError:
+            raise SSHClientError(
+                "AsyncSSHClient requires asyncssh (pip install netconfig[async])"
+            )
+
+        connect_kwargs = {
+            "port": self.port,
+            "username": self.username,
+            "connect_timeout": self.timeout,
+            # Same trust model as SSHClient's AutoAddPolicy
+            "known_hosts": None,
+        }
+
+        if self.auth_type == "key":
+            key_path = self._resolve_key_path()
+            if key_path:
+                connect_kwargs["client_keys"] = [key_path]
+                connect_kwargs["agent_path"] = None
+            # Otherwise asyncssh falls back to the agent and default keys
+        elif self.auth_type == "password":
+            if not self.password:
+                raise SSHClientError("Password authentication requires a password")
+            connect_kwargs["password"] = self.password
+            connect_kwargs["client_keys"] = None
+            connect_kwargs["agent_path"] = None
+        else:
+            raise SSHClientError(f"Unknown auth_type: {self.auth_type}")
+
+        try:
+            logger.debug(f"Connecting to {self.hostname}:{self.port} as {self.username}")
+            self._conn = await asyncssh.connect(self.hostname, **connect_kwargs)
+            logger.info(f"Connected to {self.hostname}")
+
+        except asyncssh.PermissionDenied as e:
+            raise SSHClientError(f"Authentication failed for {self.hostname}: {e}")
+        except asyncssh.Error as e:
+            raise SSHClientError(f"SSH error connecting to {self.hostname}: {e}")
+        except (OSError, asyncio.TimeoutError) as e:
+            raise SSHClientError(f"Network error connecting to {self.hostname}: {e}")
+
+    def _resolve_key_path(self) -> Optional[str]:
+        """Resolve the SSH key file path, expanding ~ and checking existence."""
+        if not self.key_file:
+            return None
+
+        path = os.path.expanduser(self.key_file)
+        if os.path.isfile(path):
+            return path
+
+        logger.warning(f"Key file not found: {path}")
+        return None
+
+    async def execute(self, cmd: str) -> str:
+        """
+        Execute a command on the remote host.
+
+        Args:
+            cmd: Command to execute
+
+        Returns:
+            Command output (stdout)
+
+        Raises:
+            SSHClientError: If not connected or command execution fails
+        """
+        if self._conn is None:
+            if self._connect_lock is None:
+                self._connect_lock = asyncio.Lock()
+            async with self._connect_lock:
+                await self.connect()
+
+        import asyncssh
+
+        try:
+            logger.debug(f"Executing on {self.hostname}: {cmd}")
+            result = await self._conn.run(
+                cmd, check=False, timeout=self.timeout, errors="replace"
+            )
+
+            if result.exit_status and result.stderr:
+                logger.debug(f"Command returned {result.exit_status}: {result.stderr.strip()}")
+
+            return result.stdout or ""
+
+        except (asyncssh.Error, OSError) as e:
+            raise SSHClientError(f"Failed to execute command on {self.hostname}: {e}")
+
+    async def close(self) -> None:
+        """Close the SSH connection."""
+        if self._conn is not None:
+            self._conn.close()
+            await self._conn.wait_closed()
+            self._conn = None
+        logger.debug(f"Disconnected from {self.hostname}")
+
+    async def __aenter__(self) -> "AsyncSSHClient":
+        """Async context manager entry - connect to host."""
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Async context manager exit - close connection."""
+        await self.close()
+
+    def __repr__(self) -> str:
+        return f"AsyncSSHClient({self.username}@{self.hostname}:{self.port})"
+
+
+def run_sync(coro: Awaitable[T]) -> T:
+    """Run a coroutine to completion from synchronous code."""
+    return asyncio.run(coro)
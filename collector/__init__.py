@@ -5,6 +5,11 @@ Collector module - 网络信息采集模块
 - interfaces: 网口信息采集
 - link_state: 链路状态采集
 - neighbor: 邻居发现
+- batch: 批量命令执行（多条命令合并为一次 SSH 调用）
+
+所有采集器都通过 ssh_client.execute(cmd) 执行远端命令。传入的客户端应当
+复用同一条已认证的 SSH 连接（每条命令只新开一个 channel），而不是每次
+调用都重新建立 TCP 连接并认证；ssh_client.SSHClient 满足这一要求。
 """
 
 from .interfaces import InterfaceCollector
@@ -0,0 +1,69 @@
+"""
+批量命令执行
+
+将多条命令拼接为一个 shell 脚本，通过一次 ssh.execute 调用执行，
+再按分隔标记拆分各命令的输出，从而把 N 次 SSH 往返合并为 1 次。
+
+另提供 "Key: value" 格式输出的远端过滤工具，只回传需要的字段。
+"""
+
+from typing import Dict, Iterable, List
+
+# 命令输出之间的分隔标记
+SECTION_MARKER = "###NETCONF-SEP###"
+
+
+def execute_batch(ssh_client, commands: List[str]) -> List[str]:
+    """
+    在一次 SSH 调用中执行多条命令
+
+    Args:
+        ssh_client: SSH 客户端，需要实现 execute(cmd) 方法
+        commands: 要执行的命令列表，各命令之间互相独立
+
+    Returns:
+        与 commands 一一对应的输出列表
+    """
+    if not commands:
+        return []
+
+    script = "".join(f"{cmd}; echo '{SECTION_MARKER}'; " for cmd in commands)
+    output = ssh_client.execute(script)
+
+    sections = output.split(f"{SECTION_MARKER}\n")[:len(commands)]
+
+    # 输出被截断时，缺失的部分视为空输出
+    while len(sections) < len(commands):
+        sections.append("")
+
+    return sections
+
+
+def key_value_filter(keys: Iterable[str]) -> str:
+    """
+    生成在远端过滤 "Key: value" 行的 awk 管道
+
+    只保留键在 keys 中的行，并以 "Key\tvalue" 格式输出，
+    例如用于 `ethtool eth0 | awk ...` 只回传速率、双工等字段。
+
+    Args:
+        keys: 需要保留的键名
+
+    Returns:
+        以 "| " 开头的管道命令片段
+    """
+    pattern = '|'.join(keys)
+    return (
+        f"| awk -F': *' '/^[ \\t]*({pattern}):/ "
+        f"{{ sub(/^[ \\t]+/, \"\", $1); print $1 \"\\t\" $2 }}'"
+    )
+
+
+def parse_key_values(output: str) -> Dict[str, str]:
+    """解析 key_value_filter 输出的 "Key\tvalue" 行"""
+    result = {}
+    for line in output.splitlines():
+        key, sep, value = line.partition('\t')
+        if sep:
+            result[key] = value.strip()
+    return result
@@ -10,14 +10,27 @@
 """
 
 import re
+import sys
 import logging
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Optional, Union, Any
+from dataclasses import dataclass, field
+
+from .batch import execute_batch, key_value_filter, parse_key_values
 
 logger = logging.getLogger(__name__)
 
+# Python 3.10+ 使用 __slots__ 布局，去掉每个实例的 __dict__
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# ip link 输出解析用的正则（模块加载时编译一次）
+_MAC_RE = re.compile(r'link/ether\s+([0-9a-fA-F:]+)')
+_MTU_RE = re.compile(r'mtu\s+(\d+)')
+
+# IPv6 link-local 地址 fe80::/10 的前缀（已转为小写的地址）
+_LINK_LOCAL_V6_PREFIXES = ('fe8', 'fe9', 'fea', 'feb')
 
-@dataclass
+
+@dataclass(**_DATACLASS_SLOTS)
 class InterfaceInfo:
     """网络接口信息"""
     name: str
@@ -32,44 +45,90 @@ class InterfaceInfo:
     link_detected: bool = False
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            'name': self.name,
+            'mac': self.mac,
+            'state': self.state,
+            'mtu': self.mtu,
+            'speed': self.speed,
+            'duplex': self.duplex,
+            'driver': self.driver,
+            'ipv4_addresses': list(self.ipv4_addresses),
+            'ipv6_addresses': list(self.ipv6_addresses),
+            'link_detected': self.link_detected,
+        }
 
 
 class InterfaceCollector:
     """网络接口信息采集器"""
 
-    def __init__(self, ssh_client):
+    # ethtool / ethtool -i 输出中关心的字段到 InterfaceInfo 属性的映射
+    _ETHTOOL_KEYS = {
+        'Speed': 'speed',
+        'Duplex': 'duplex',
+        'Link detected': 'link_detected',
+        'driver': 'driver',
+    }
+
+    def __init__(self, ssh_client,
+                 exclude_patterns: Union[List[str], re.Pattern, None] = None):
         """
         初始化采集器
 
         Args:
             ssh_client: SSH 客户端，需要实现 execute(cmd) 方法
+            exclude_patterns: 要排除的接口名称正则模式列表，
+                也可以是已编译好的正则（如 inventory 中的 exclude_interfaces_re）
         """
         self.ssh = ssh_client
+        self._exclude_re = self._compile_exclude_patterns(exclude_patterns)
 
     def collect(self, exclude_patterns: Optional[List[str]] = None) -> Dict[str, InterfaceInfo]:
         """
         采集所有网络接口信息
 
         Args:
-            exclude_patterns: 要排除的接口名称正则模式列表
+            exclude_patterns: 要排除的接口名称正则模式列表，
+                None 表示使用初始化时指定的模式
 
         Returns:
             接口名到接口信息的映射
         """
         interfaces = {}
 
-        # 获取接口列表
-        interface_names = self._get_interface_names()
+        # 获取接口列表及其 ip link 信息（一次命令覆盖所有接口）
+        link_info = self._get_all_link_info()
+        interface_names = list(link_info)
 
         # 过滤排除的接口
+        exclude_re = self._exclude_re
         if exclude_patterns:
-            interface_names = self._filter_interfaces(interface_names, exclude_patterns)
+            exclude_re = self._compile_exclude_patterns(exclude_patterns)
+        if exclude_re:
+            interface_names = [n for n in interface_names if not exclude_re.match(n)]
 
-        # 采集每个接口的详细信息
+        if not interface_names:
+            return interfaces
+
+        # 所有接口的采集命令合并为一次 SSH 调用
+        commands = []
         for name in interface_names:
+            commands.extend(self._interface_commands(name))
+
+        try:
+            outputs = execute_batch(self.ssh, commands)
+        except Exception as e:
+            # 仍按空输出解析，保留 ip link 中的 MAC、状态和 MTU（拓扑推断依赖 MAC）
+            logger.warning(f"Failed to collect interface info: {e}")
+            outputs = [""] * len(commands)
+
+        # 按接口拆分输出并解析
+        step = len(commands) // len(interface_names)
+        for i, name in enumerate(interface_names):
             try:
-                info = self._collect_interface_info(name)
+                info = self._parse_interface_info(
+                    name, link_info[name], outputs[i * step:(i + 1) * step]
+                )
                 interfaces[name] = info
             except Exception as e:
                 logger.warning(f"Failed to collect info for interface {name}: {e}")
@@ -77,58 +136,64 @@ class InterfaceCollector:
 
         return interfaces
 
-    def _get_interface_names(self) -> List[str]:
-        """获取所有网络接口名称"""
-        # 使用 ip link show 获取接口列表
-        cmd = "ip -o link show | awk -F': ' '{print $2}' | cut -d'@' -f1"
-        output = self.ssh.execute(cmd)
+    def _get_all_link_info(self) -> Dict[str, str]:
+        """
+        获取所有网络接口及其 ip link 信息
 
-        names = []
-        for line in output.strip().split('\n'):
-            name = line.strip()
+        Returns:
+            接口名到 `ip -o link show` 原始输出行的映射
+        """
+        output = self.ssh.execute("ip -o link show")
+
+        link_info = {}
+        for line in output.splitlines():
+            # 格式: "<index>: <name>[@<parent>]: <flags> mtu ..."
+            parts = line.split(': ', 2)
+            if len(parts) < 3:
+                continue
+            name = parts[1].strip().split('@')[0]
             if name:
-                names.append(name)
-
-        return names
-
-    def _filter_interfaces(self, names: List[str], patterns: List[str]) -> List[str]:
-        """根据正则模式过滤接口"""
-        filtered = []
-        compiled_patterns = [re.compile(p) for p in patterns]
-
-        for name in names:
-            exclude = False
-            for pattern in compiled_patterns:
-                if pattern.match(name):
-                    exclude = True
-                    break
-            if not exclude:
-                filtered.append(name)
-
-        return filtered
-
-    def _collect_interface_info(self, name: str) -> InterfaceInfo:
-        """采集单个接口的详细信息"""
+                link_info[name] = line
+
+        return link_info
+
+    @staticmethod
+    def _compile_exclude_patterns(
+            patterns: Union[List[str], re.Pattern, None]) -> Optional[re.Pattern]:
+        """将排除模式合并为一个交替正则，每个接口名只需匹配一次"""
+        if not patterns:
+            return None
+        if isinstance(patterns, re.Pattern):
+            return patterns
+        return re.compile('|'.join(f'(?:{p})' for p in patterns))
+
+    def _interface_commands(self, name: str) -> List[str]:
+        """单个接口需要执行的命令，顺序与 _parse_interface_info 对应"""
+        return [
+            # IPv4 / IPv6 地址
+            f"ip -4 -o addr show {name} | awk '{{print $4}}'",
+            f"ip -6 -o addr show {name} | awk '{{print $4}}'",
+            # ethtool 信息（速率、双工、驱动），在远端只保留需要的字段
+            f"{{ ethtool {name}; ethtool -i {name}; }} 2>/dev/null "
+            + key_value_filter(self._ETHTOOL_KEYS),
+        ]
+
+    def _parse_interface_info(self, name: str, link_line: str,
+                              outputs: List[str]) -> InterfaceInfo:
+        """根据 ip link 输出行和批量命令的输出解析单个接口的详细信息"""
+        ipv4_out, ipv6_out, ethtool_out = outputs
         info = InterfaceInfo(name=name)
 
-        # 获取基本信息（MAC, state, MTU）
-        self._collect_basic_info(info)
-
-        # 获取 IP 地址
-        self._collect_ip_addresses(info)
-
-        # 获取 ethtool 信息（速率、双工、驱动）
-        self._collect_ethtool_info(info)
+        self._parse_basic_info(info, link_line)
+        self._parse_ip_addresses(info, ipv4_out, ipv6_out)
+        self._parse_ethtool_info(info, ethtool_out)
 
         return info
 
-    def _collect_basic_info(self, info: InterfaceInfo):
-        """采集接口基本信息"""
-        cmd = f"ip -o link show {info.name}"
-        output = self.ssh.execute(cmd)
-
+    def _parse_basic_info(self, info: InterfaceInfo, output: str):
+        """解析接口基本信息"""
         # 解析 MAC 地址
-        mac_match = re.search(r'link/ether\s+([0-9a-fA-F:]+)', output)
+        mac_match = _MAC_RE.search(output)
         if mac_match:
             info.mac = mac_match.group(1).lower()
 
@@ -145,52 +210,36 @@ class InterfaceCollector:
                 info.state = 'down'
 
         # 解析 MTU
-        mtu_match = re.search(r'mtu\s+(\d+)', output)
+        mtu_match = _MTU_RE.search(output)
         if mtu_match:
             info.mtu = int(mtu_match.group(1))
 
-    def _collect_ip_addresses(self, info: InterfaceInfo):
-        """采集接口 IP 地址"""
+    def _parse_ip_addresses(self, info: InterfaceInfo, ipv4_output: str, ipv6_output: str):
+        """解析接口 IP 地址"""
         # IPv4 地址
-        cmd = f"ip -4 -o addr show {info.name} | awk '{{print $4}}'"
-        output = self.ssh.execute(cmd)
-        for line in output.strip().split('\n'):
-            addr = line.strip()
-            if addr:
-                info.ipv4_addresses.append(addr)
-
-        # IPv6 地址
-        cmd = f"ip -6 -o addr show {info.name} | awk '{{print $4}}'"
-        output = self.ssh.execute(cmd)
-        for line in output.strip().split('\n'):
-            addr = line.strip()
-            if addr and not addr.startswith('fe80::'):  # 排除 link-local
-                info.ipv6_addresses.append(addr)
-
-    def _collect_ethtool_info(self, info: InterfaceInfo):
-        """采集 ethtool 信息"""
-        # 获取链路状态和速率
-        cmd = f"ethtool {info.name} 2>/dev/null"
-        output = self.ssh.execute(cmd)
-
-        # 解析速率
-        speed_match = re.search(r'Speed:\s*(\S+)', output)
-        if speed_match:
-            info.speed = speed_match.group(1)
-
-        # 解析双工模式
-        duplex_match = re.search(r'Duplex:\s*(\S+)', output)
-        if duplex_match:
-            info.duplex = duplex_match.group(1).lower()
-
-        # 解析链路检测
-        link_match = re.search(r'Link detected:\s*(\S+)', output)
-        if link_match:
-            info.link_detected = link_match.group(1).lower() == 'yes'
-
-        # 获取驱动信息
-        cmd = f"ethtool -i {info.name} 2>/dev/null | grep driver"
-        output = self.ssh.execute(cmd)
-        driver_match = re.search(r'driver:\s*(\S+)', output)
-        if driver_match:
-            info.driver = driver_match.group(1)
+        info.ipv4_addresses = [
+            a for a in (line.strip() for line in ipv4_output.splitlines()) if a
+        ]
+
+        # IPv6 地址（统一为小写，排除 link-local）
+        info.ipv6_addresses = [
+            a for a in (line.strip().lower() for line in ipv6_output.splitlines())
+            if a and not a.startswith(_LINK_LOCAL_V6_PREFIXES)
+        ]
+
+    def _parse_ethtool_info(self, info: InterfaceInfo, output: str):
+        """解析远端过滤后的 ethtool 信息（"Key\tvalue" 行）"""
+        for key, value in parse_key_values(output).items():
+            attr = self._ETHTOOL_KEYS.get(key)
+            if not attr:
+                continue
+
+            # 只取值的第一个字段，如 "Unknown! (255)" -> "Unknown!"
+            value = value.split(None, 1)[0] if value else ''
+
+            if attr == 'link_detected':
+                info.link_detected = value.lower() == 'yes'
+            elif attr == 'duplex':
+                info.duplex = value.lower()
+            else:
+                setattr(info, attr, value)
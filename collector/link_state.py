@@ -8,15 +8,20 @@
 - 错误计数
 """
 
-import re
+import sys
 import logging
-from typing import Dict, Optional, Any
-from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Optional, Any
+from dataclasses import dataclass, field
+
+from .batch import execute_batch, key_value_filter, parse_key_values
 
 logger = logging.getLogger(__name__)
 
+# Python 3.10+ 使用 __slots__ 布局，去掉每个实例的 __dict__
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class LinkStats:
     """链路统计信息"""
     rx_bytes: int = 0
@@ -29,10 +34,19 @@ class LinkStats:
     tx_dropped: int = 0
 
     def to_dict(self) -> Dict[str, int]:
-        return asdict(self)
+        return {
+            'rx_bytes': self.rx_bytes,
+            'rx_packets': self.rx_packets,
+            'rx_errors': self.rx_errors,
+            'rx_dropped': self.rx_dropped,
+            'tx_bytes': self.tx_bytes,
+            'tx_packets': self.tx_packets,
+            'tx_errors': self.tx_errors,
+            'tx_dropped': self.tx_dropped,
+        }
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class LinkState:
     """链路状态信息"""
     interface: str
@@ -45,14 +59,43 @@ class LinkState:
     stats: LinkStats = field(default_factory=LinkStats)
 
     def to_dict(self) -> Dict[str, Any]:
-        result = asdict(self)
-        result['stats'] = self.stats.to_dict()
-        return result
+        return {
+            'interface': self.interface,
+            'carrier': self.carrier,
+            'operstate': self.operstate,
+            'link_detected': self.link_detected,
+            'speed': self.speed,
+            'duplex': self.duplex,
+            'autoneg': self.autoneg,
+            'stats': self.stats.to_dict(),
+        }
 
 
 class LinkStateCollector:
     """链路状态采集器"""
 
+    # /sys/class/net/<if>/statistics 下采集的文件（与 LinkStats 属性同名）
+    STATS_FILES = (
+        'rx_bytes', 'rx_packets', 'rx_errors', 'rx_dropped',
+        'tx_bytes', 'tx_packets', 'tx_errors', 'tx_dropped',
+    )
+
+    # ethtool 输出中关心的字段到 LinkState 属性的映射
+    _ETHTOOL_KEYS = {
+        'Speed': 'speed',
+        'Duplex': 'duplex',
+        'Auto-negotiation': 'autoneg',
+        'Link detected': 'link_detected',
+    }
+
+    # 需要报告的计数器：(LinkStats 属性, 报告中的名称)
+    _COUNTER_ISSUES = (
+        ('rx_errors', 'RX errors'),
+        ('tx_errors', 'TX errors'),
+        ('rx_dropped', 'RX dropped'),
+        ('tx_dropped', 'TX dropped'),
+    )
+
     def __init__(self, ssh_client):
         """
         初始化采集器
@@ -74,9 +117,25 @@ class LinkStateCollector:
         """
         states = {}
 
+        if not interfaces:
+            return states
+
+        # 所有接口的采集命令合并为一次 SSH 调用
+        commands = []
         for iface in interfaces:
+            commands.extend(self._link_state_commands(iface))
+
+        try:
+            outputs = execute_batch(self.ssh, commands)
+        except Exception as e:
+            logger.warning(f"Failed to collect link states: {e}")
+            return {iface: LinkState(interface=iface) for iface in interfaces}
+
+        # 按接口拆分输出并解析
+        step = len(commands) // len(interfaces)
+        for i, iface in enumerate(interfaces):
             try:
-                state = self._collect_link_state(iface)
+                state = self._parse_link_state(iface, outputs[i * step:(i + 1) * step])
                 states[iface] = state
             except Exception as e:
                 logger.warning(f"Failed to collect link state for {iface}: {e}")
@@ -84,96 +143,96 @@ class LinkStateCollector:
 
         return states
 
-    def _collect_link_state(self, interface: str) -> LinkState:
-        """采集单个接口的链路状态"""
+    def _link_state_commands(self, interface: str) -> List[str]:
+        """单个接口需要执行的命令，顺序与 _parse_link_state 对应"""
+        sys_path = f"/sys/class/net/{interface}"
+        stat_files = ' '.join(self.STATS_FILES)
+        return [
+            f"cat {sys_path}/operstate 2>/dev/null",
+            f"cat {sys_path}/carrier 2>/dev/null",
+            f"ethtool {interface} 2>/dev/null " + key_value_filter(self._ETHTOOL_KEYS),
+            # 一条命令读取全部统计文件，输出形如 "rx_bytes:123"
+            f"cd {sys_path}/statistics 2>/dev/null && grep . {stat_files} 2>/dev/null",
+        ]
+
+    def _parse_link_state(self, interface: str, outputs: List[str]) -> LinkState:
+        """根据批量命令的输出解析单个接口的链路状态"""
+        operstate_out, carrier_out, ethtool_out, stats_out = outputs
         state = LinkState(interface=interface)
 
-        # 获取 operstate
-        self._collect_operstate(state)
+        # 操作状态
+        self._parse_operstate(state, operstate_out)
 
-        # 获取 carrier 状态
-        self._collect_carrier(state)
+        # carrier 状态
+        self._parse_carrier(state, carrier_out)
 
-        # 获取 ethtool 链路信息
-        self._collect_ethtool_link(state)
+        # ethtool 链路信息
+        self._parse_ethtool_link(state, ethtool_out)
 
-        # 获取统计信息
-        self._collect_stats(state)
+        # 统计信息
+        self._parse_stats(state, stats_out)
 
         return state
 
-    def _collect_operstate(self, state: LinkState):
-        """采集操作状态"""
-        cmd = f"cat /sys/class/net/{state.interface}/operstate 2>/dev/null"
-        output = self.ssh.execute(cmd).strip()
+    def _parse_operstate(self, state: LinkState, output: str):
+        """解析操作状态"""
+        output = output.strip()
 
         if output in ['up', 'down', 'unknown', 'dormant', 'notpresent',
                       'lowerlayerdown', 'testing']:
             state.operstate = output
 
-    def _collect_carrier(self, state: LinkState):
-        """采集载波状态"""
-        cmd = f"cat /sys/class/net/{state.interface}/carrier 2>/dev/null"
-        output = self.ssh.execute(cmd).strip()
-
+    def _parse_carrier(self, state: LinkState, output: str):
+        """解析载波状态"""
         try:
-            state.carrier = int(output) == 1
+            state.carrier = int(output.strip()) == 1
         except ValueError:
             state.carrier = False
 
-    def _collect_ethtool_link(self, state: LinkState):
-        """采集 ethtool 链路信息"""
-        cmd = f"ethtool {state.interface} 2>/dev/null"
-        output = self.ssh.execute(cmd)
-
-        # 解析速率
-        speed_match = re.search(r'Speed:\s*(\S+)', output)
-        if speed_match:
-            state.speed = speed_match.group(1)
-
-        # 解析双工
-        duplex_match = re.search(r'Duplex:\s*(\S+)', output)
-        if duplex_match:
-            state.duplex = duplex_match.group(1).lower()
-
-        # 解析自动协商
-        autoneg_match = re.search(r'Auto-negotiation:\s*(\S+)', output)
-        if autoneg_match:
-            state.autoneg = autoneg_match.group(1).lower()
-
-        # 解析链路检测
-        link_match = re.search(r'Link detected:\s*(\S+)', output)
-        if link_match:
-            state.link_detected = link_match.group(1).lower() == 'yes'
-
-    def _collect_stats(self, state: LinkState):
-        """采集接口统计信息"""
-        # 使用 /sys/class/net 获取统计信息
-        stats_path = f"/sys/class/net/{state.interface}/statistics"
-
-        stats_map = {
-            'rx_bytes': 'rx_bytes',
-            'rx_packets': 'rx_packets',
-            'rx_errors': 'rx_errors',
-            'rx_dropped': 'rx_dropped',
-            'tx_bytes': 'tx_bytes',
-            'tx_packets': 'tx_packets',
-            'tx_errors': 'tx_errors',
-            'tx_dropped': 'tx_dropped',
-        }
-
-        for stat_file, attr in stats_map.items():
-            cmd = f"cat {stats_path}/{stat_file} 2>/dev/null"
-            output = self.ssh.execute(cmd).strip()
+    def _parse_ethtool_link(self, state: LinkState, output: str):
+        """解析远端过滤后的 ethtool 链路信息（"Key\tvalue" 行）"""
+        for key, value in parse_key_values(output).items():
+            attr = self._ETHTOOL_KEYS.get(key)
+            if not attr:
+                continue
+
+            # 只取值的第一个字段，如 "Unknown! (255)" -> "Unknown!"
+            value = value.split(None, 1)[0] if value else ''
+
+            if attr == 'link_detected':
+                state.link_detected = value.lower() == 'yes'
+            elif attr == 'speed':
+                state.speed = value
+            else:
+                setattr(state, attr, value.lower())
+
+    def _parse_stats(self, state: LinkState, output: str):
+        """解析接口统计信息（grep 输出的 "文件名:值" 行）"""
+        for line in output.splitlines():
+            name, sep, value = line.partition(':')
+            if not sep or name not in self.STATS_FILES:
+                continue
             try:
-                setattr(state.stats, attr, int(output))
+                setattr(state.stats, name, int(value.strip()))
             except ValueError:
                 pass
 
+    @staticmethod
+    def fast_health(state: LinkState) -> bool:
+        """
+        快速判断链路是否健康
+
+        与 check_link_health 的 'healthy' 结果一致，但不构造问题列表，
+        适合只需要布尔结果的场景（如逐接口轮询的状态面板）。
+        """
+        return (state.link_detected or state.carrier) and state.operstate != 'down'
+
     def check_link_health(self, state: LinkState) -> Dict[str, Any]:
         """
         检查链路健康状态
 
+        只需要布尔结果时请使用 fast_health。
+
         Returns:
             包含健康检查结果的字典
         """
@@ -193,17 +252,11 @@ class LinkStateCollector:
             health['healthy'] = False
             health['issues'].append('Interface is administratively down')
 
-        # 检查错误计数
-        if state.stats.rx_errors > 0:
-            health['issues'].append(f'RX errors: {state.stats.rx_errors}')
-
-        if state.stats.tx_errors > 0:
-            health['issues'].append(f'TX errors: {state.stats.tx_errors}')
-
-        if state.stats.rx_dropped > 0:
-            health['issues'].append(f'RX dropped: {state.stats.rx_dropped}')
-
-        if state.stats.tx_dropped > 0:
-            health['issues'].append(f'TX dropped: {state.stats.tx_dropped}')
+        # 检查错误/丢包计数（仅在计数非零时才格式化消息）
+        stats = state.stats
+        for attr, label in self._COUNTER_ISSUES:
+            value = getattr(stats, attr)
+            if value > 0:
+                health['issues'].append(f'{label}: {value}')
 
         return health
@@ -9,15 +9,38 @@
 
 import re
 import time
+import sys
 import logging
-import ipaddress
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 from typing import Dict, List, Optional, Any, Tuple
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
 
+# Python 3.10+ 使用 __slots__ 布局，去掉每个实例的 __dict__
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+# lldpcli / arp-scan / arping 输出解析用的正则（模块加载时编译一次）
+_IFACE_RE = re.compile(r'Interface:\s*(\S+),')
+# arp-scan 输出行: "169.254.2.1\taa:bb:cc:dd:ee:ff\t(Unknown)"
+_ARP_SCAN_RE = re.compile(r'^(\d+\.\d+\.\d+\.\d+)\s+([0-9a-fA-F:]{17})\b', re.MULTILINE)
+# arping 输出行: "Unicast reply from 169.254.2.1 [AA:BB:CC:DD:EE:FF]  0.715ms"
+_ARPING_REPLY_RE = re.compile(r'reply from\s+(\d+\.\d+\.\d+\.\d+)\s+\[([0-9a-fA-F:]+)\]')
+
+# ip neigh 表项状态
+_ARP_STATES = frozenset({'REACHABLE', 'STALE', 'DELAY', 'PROBE', 'FAILED', 'PERMANENT'})
+
+# lldpcli 字段名到 LLDPNeighbor 属性的映射
+_LLDP_FIELDS = {
+    'SysName': 'remote_system_name',
+    'PortID': 'remote_port_id',
+    'PortDescr': 'remote_port_desc',
+    'MgmtIP': 'remote_mgmt_ip',
+}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class LLDPNeighbor:
     """LLDP 邻居信息"""
     local_interface: str
@@ -28,10 +51,17 @@ class LLDPNeighbor:
     remote_mgmt_ip: str = ""
 
     def to_dict(self) -> Dict[str, str]:
-        return asdict(self)
+        return {
+            'local_interface': self.local_interface,
+            'remote_system_name': self.remote_system_name,
+            'remote_port_id': self.remote_port_id,
+            'remote_port_desc': self.remote_port_desc,
+            'remote_mac': self.remote_mac,
+            'remote_mgmt_ip': self.remote_mgmt_ip,
+        }
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class ARPEntry:
     """ARP 表项"""
     ip_address: str
@@ -40,10 +70,15 @@ class ARPEntry:
     state: str = ""  # REACHABLE, STALE, DELAY, etc.
 
     def to_dict(self) -> Dict[str, str]:
-        return asdict(self)
+        return {
+            'ip_address': self.ip_address,
+            'mac_address': self.mac_address,
+            'interface': self.interface,
+            'state': self.state,
+        }
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class NeighborInfo:
     """邻居信息汇总"""
     local_interface: str
@@ -55,7 +90,44 @@ class NeighborInfo:
     bidirectional: bool = False  # 是否双向确认
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            'local_interface': self.local_interface,
+            'discovery_method': self.discovery_method,
+            'remote_mac': self.remote_mac,
+            'remote_host': self.remote_host,
+            'remote_interface': self.remote_interface,
+            'remote_ip': self.remote_ip,
+            'bidirectional': self.bidirectional,
+        }
+
+
+class NeighborList(list):
+    """
+    单个接口的邻居列表，按远端 MAC 去重
+
+    内部维护已出现 MAC 的集合，add() 的去重检查为 O(1)。
+    没有 MAC 的邻居（如未携带 MAC 的 LLDP 邻居）不参与去重。
+    """
+
+    __slots__ = ('_macs',)
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self._macs = {n.remote_mac for n in self if n.remote_mac}
+
+    def add(self, info: NeighborInfo) -> bool:
+        """
+        添加邻居，若已存在相同远端 MAC 的邻居则忽略
+
+        Returns:
+            是否实际添加
+        """
+        if info.remote_mac:
+            if info.remote_mac in self._macs:
+                return False
+            self._macs.add(info.remote_mac)
+        self.append(info)
+        return True
 
 
 class NeighborDiscovery:
@@ -64,16 +136,22 @@ class NeighborDiscovery:
     # Link-local 地址范围（169.254.0.0/16）
     LINK_LOCAL_BASE = "169.254"
 
+    # discover_all 中并发执行的最大 SSH 命令数
+    MAX_WORKERS = 16
+
     def __init__(self, ssh_client, host_id: int = 0):
         """
         初始化邻居发现器
 
         Args:
-            ssh_client: SSH 客户端
+            ssh_client: SSH 客户端。discover_all 会在多个线程中并发调用
+                execute(cmd)，因此客户端必须是线程安全的
             host_id: 主机标识符（用于生成唯一的 link-local IP）
         """
         self.ssh = ssh_client
         self.host_id = host_id
+        # lldpcli 是否可用；None 表示尚未探测
+        self._lldp_available: Optional[bool] = None
 
     def discover_lldp(self, interfaces: Optional[List[str]] = None) -> Dict[str, LLDPNeighbor]:
         """
@@ -87,14 +165,20 @@ class NeighborDiscovery:
         """
         neighbors = {}
 
-        # 检查 lldpd 是否运行
-        check_cmd = "which lldpcli 2>/dev/null && lldpcli show neighbors 2>/dev/null"
-        output = self.ssh.execute(check_cmd)
+        # 之前已确认 lldpcli 不可用时不再重复探测
+        if self._lldp_available is False:
+            return neighbors
+
+        # 直接查询邻居；lldpcli 不存在或 lldpd 未运行时输出为空
+        output = self.ssh.execute("lldpcli show neighbors 2>/dev/null || true")
 
-        if not output.strip() or 'command not found' in output.lower():
-            logger.info("LLDP not available or no neighbors found")
+        if not output.strip():
+            logger.info("LLDP not available")
+            self._lldp_available = False
             return neighbors
 
+        self._lldp_available = True
+
         # 解析 LLDP 邻居信息
         neighbors = self._parse_lldp_output(output, interfaces)
 
@@ -107,11 +191,11 @@ class NeighborDiscovery:
         current_interface = None
         current_neighbor = None
 
-        for line in output.split('\n'):
+        for line in output.splitlines():
             line = line.strip()
 
             # 检测接口
-            iface_match = re.match(r'Interface:\s*(\S+),', line)
+            iface_match = _IFACE_RE.match(line)
             if iface_match:
                 if current_neighbor and current_interface:
                     neighbors[current_interface] = current_neighbor
@@ -129,14 +213,11 @@ class NeighborDiscovery:
                 continue
 
             # 解析邻居属性
-            if line.startswith('SysName:'):
-                current_neighbor.remote_system_name = line.split(':', 1)[1].strip()
-            elif line.startswith('PortID:'):
-                current_neighbor.remote_port_id = line.split(':', 1)[1].strip()
-            elif line.startswith('PortDescr:'):
-                current_neighbor.remote_port_desc = line.split(':', 1)[1].strip()
-            elif line.startswith('MgmtIP:'):
-                current_neighbor.remote_mgmt_ip = line.split(':', 1)[1].strip()
+            key, sep, value = line.partition(':')
+            if sep:
+                attr = _LLDP_FIELDS.get(key)
+                if attr:
+                    setattr(current_neighbor, attr, value.strip())
 
         # 保存最后一个
         if current_neighbor and current_interface:
@@ -160,41 +241,31 @@ class NeighborDiscovery:
         cmd = "ip neigh show"
         output = self.ssh.execute(cmd)
 
-        for line in output.strip().split('\n'):
-            if not line.strip():
-                continue
+        wanted = set(interfaces) if interfaces else None
 
+        for line in output.splitlines():
+            # 格式: "<ip> dev <iface> lladdr <mac> [router] <STATE>"
+            # 没有 lladdr 的表项（如 FAILED/INCOMPLETE）直接跳过
             parts = line.split()
-            if len(parts) < 4:
+            if len(parts) < 5 or parts[1] != 'dev' or parts[3] != 'lladdr':
                 continue
 
-            ip = parts[0]
-            iface = None
-            mac = None
-            state = ""
-
-            for i, part in enumerate(parts):
-                if part == 'dev' and i + 1 < len(parts):
-                    iface = parts[i + 1]
-                elif part == 'lladdr' and i + 1 < len(parts):
-                    mac = parts[i + 1]
-                elif part in ['REACHABLE', 'STALE', 'DELAY', 'PROBE', 'FAILED', 'PERMANENT']:
-                    state = part
-
-            if iface and mac:
-                if interfaces and iface not in interfaces:
-                    continue
+            ip, iface, mac = parts[0], parts[2], parts[4]
+            state = parts[-1] if parts[-1] in _ARP_STATES else ""
+
+            if wanted and iface not in wanted:
+                continue
 
-                entry = ARPEntry(
-                    ip_address=ip,
-                    mac_address=mac.lower(),
-                    interface=iface,
-                    state=state
-                )
+            entry = ARPEntry(
+                ip_address=ip,
+                mac_address=mac.lower(),
+                interface=iface,
+                state=state
+            )
 
-                if iface not in entries:
-                    entries[iface] = []
-                entries[iface].append(entry)
+            if iface not in entries:
+                entries[iface] = []
+            entries[iface].append(entry)
 
         return entries
 
@@ -245,19 +316,24 @@ class NeighborDiscovery:
 
             # 发送 ARP 探测
             # 扫描同网段可能的邻居
+            targets = []
             for third in range(1, 10):  # 假设最多 9 台主机
                 for fourth in range(1, 10):  # 每台最多 9 个接口
                     if third == (self.host_id % 254) + 1 and fourth == (interface_index % 254) + 1:
                         continue  # 跳过自己
-
-                    target_ip = f"{self.LINK_LOCAL_BASE}.{third}.{fourth}"
-                    arping_cmd = f"arping -I {interface} -c 1 -w 1 {target_ip} 2>/dev/null"
-                    output = self.ssh.execute(arping_cmd)
-
-                    # 解析响应
-                    mac_match = re.search(r'\[([0-9a-fA-F:]+)\]', output)
-                    if mac_match and 'Received 1 response' in output:
-                        neighbors.append((target_ip, mac_match.group(1).lower()))
+                    targets.append(f"{self.LINK_LOCAL_BASE}.{third}.{fourth}")
+
+            # 一次 SSH 调用完成整个扫描：优先使用 arp-scan 一次性广播，
+            # 否则在远端并发执行 arping 后统一等待
+            target_list = ' '.join(targets)
+            scan_cmd = (
+                f"if command -v arp-scan >/dev/null 2>&1; then "
+                f"arp-scan --interface={interface} --retry=1 --timeout=500 {target_list} 2>/dev/null; "
+                f"else for ip in {target_list}; do "
+                f"arping -I {interface} -c 1 -w 1 $ip 2>/dev/null & done; wait; fi"
+            )
+            output = self.ssh.execute(scan_cmd)
+            neighbors = self._parse_probe_output(output)
 
         except Exception as e:
             logger.error(f"Probe failed for {interface}: {e}")
@@ -268,10 +344,24 @@ class NeighborDiscovery:
 
         return neighbors
 
+    def _parse_probe_output(self, output: str) -> List[Tuple[str, str]]:
+        """解析 arp-scan 或 arping 的输出，返回 [(ip, mac), ...]"""
+        neighbors = []
+        seen_ips = set()
+
+        matches = chain(_ARP_SCAN_RE.findall(output), _ARPING_REPLY_RE.findall(output))
+        for ip, mac in matches:
+            if ip in seen_ips:
+                continue  # arp-scan 可能报告重复响应
+            seen_ips.add(ip)
+            neighbors.append((ip, mac.lower()))
+
+        return neighbors
+
     def discover_all(self, interfaces: List[str],
                      use_lldp: bool = True,
                      use_arp: bool = True,
-                     use_probe: bool = False) -> Dict[str, List[NeighborInfo]]:
+                     use_probe: bool = False) -> Dict[str, NeighborList]:
         """
         使用所有可用方法发现邻居
 
@@ -284,58 +374,62 @@ class NeighborDiscovery:
         Returns:
             接口名到邻居信息列表的映射
         """
-        all_neighbors: Dict[str, List[NeighborInfo]] = {iface: [] for iface in interfaces}
+        all_neighbors: Dict[str, NeighborList] = {iface: NeighborList() for iface in interfaces}
+
+        # LLDP、ARP 与各接口的主动探测互相独立，并发执行以重叠 SSH 往返；
+        # 结果仍按 LLDP -> ARP -> 探测 的优先级合并
+        lldp_neighbors: Dict[str, LLDPNeighbor] = {}
+        arp_entries: Dict[str, List[ARPEntry]] = {}
+        probe_results: List[List[Tuple[str, str]]] = []
+
+        task_count = int(use_lldp) + int(use_arp) + (len(interfaces) if use_probe else 0)
+        if task_count:
+            with ThreadPoolExecutor(max_workers=min(self.MAX_WORKERS, task_count)) as executor:
+                lldp_future = executor.submit(self.discover_lldp, interfaces) if use_lldp else None
+                arp_future = executor.submit(self.discover_arp, interfaces) if use_arp else None
+                probe_futures = [
+                    executor.submit(self.probe_interface, iface, idx)
+                    for idx, iface in enumerate(interfaces)
+                ] if use_probe else []
+
+                if lldp_future:
+                    lldp_neighbors = lldp_future.result()
+                if arp_future:
+                    arp_entries = arp_future.result()
+                probe_results = [f.result() for f in probe_futures]
 
         # LLDP 发现
         if use_lldp:
-            lldp_neighbors = self.discover_lldp(interfaces)
             for iface, neighbor in lldp_neighbors.items():
-                info = NeighborInfo(
+                all_neighbors[iface].add(NeighborInfo(
                     local_interface=iface,
                     discovery_method='lldp',
                     remote_mac=neighbor.remote_mac,
                     remote_host=neighbor.remote_system_name,
                     remote_interface=neighbor.remote_port_id or neighbor.remote_port_desc,
                     remote_ip=neighbor.remote_mgmt_ip
-                )
-                all_neighbors[iface].append(info)
+                ))
 
-        # ARP 发现
+        # ARP 发现（已存在相同 MAC 的邻居时跳过）
         if use_arp:
-            arp_entries = self.discover_arp(interfaces)
             for iface, entries in arp_entries.items():
                 for entry in entries:
-                    # 检查是否已存在（通过 MAC 匹配）
-                    exists = any(
-                        n.remote_mac == entry.mac_address
-                        for n in all_neighbors.get(iface, [])
-                    )
-                    if not exists:
-                        info = NeighborInfo(
-                            local_interface=iface,
-                            discovery_method='arp',
-                            remote_mac=entry.mac_address,
-                            remote_ip=entry.ip_address
-                        )
-                        all_neighbors[iface].append(info)
-
-        # 主动探测
+                    all_neighbors[iface].add(NeighborInfo(
+                        local_interface=iface,
+                        discovery_method='arp',
+                        remote_mac=entry.mac_address,
+                        remote_ip=entry.ip_address
+                    ))
+
+        # 主动探测（已存在相同 MAC 的邻居时跳过）
         if use_probe:
-            for idx, iface in enumerate(interfaces):
-                probe_results = self.probe_interface(iface, idx)
-                for ip, mac in probe_results:
-                    # 检查是否已存在
-                    exists = any(
-                        n.remote_mac == mac
-                        for n in all_neighbors.get(iface, [])
-                    )
-                    if not exists:
-                        info = NeighborInfo(
-                            local_interface=iface,
-                            discovery_method='probe',
-                            remote_mac=mac,
-                            remote_ip=ip
-                        )
-                        all_neighbors[iface].append(info)
+            for iface, results in zip(interfaces, probe_results):
+                for ip, mac in results:
+                    all_neighbors[iface].add(NeighborInfo(
+                        local_interface=iface,
+                        discovery_method='probe',
+                        remote_mac=mac,
+                        remote_ip=ip
+                    ))
 
         return all_neighbors
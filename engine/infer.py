@@ -8,24 +8,52 @@ Builds a network topology from collected host data by:
 """
 
 import logging
+import sys
 from typing import Dict, List, Optional, Set, Tuple, Any
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 
 logger = logging.getLogger(__name__)
 
+# Python 3.10+ gets a __slots__ layout, dropping the per-instance __dict__
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+def _mac_to_bytes(mac: str) -> bytes:
+    """
+    Convert "aa:bb:cc:dd:ee:ff" to its 6-byte form for use as a dict key.
+
+    Malformed strings fall back to their lowercased UTF-8 encoding so they
+    still match themselves exactly as before.
+    """
+    try:
+        return bytes.fromhex(mac.replace(":", ""))
+    except ValueError:
+        return mac.lower().encode()
+
+
+@dataclass(frozen=True, eq=False, **_DATACLASS_SLOTS)
 class Port:
-    """Represents a network port (interface) on a host."""
+    """
+    Represents a network port (interface) on a host.
+
+    Ports are immutable and identified by (host, interface); the hash is
+    computed on first use and cached, since ports are used as dict keys
+    in every neighbor lookup during inference.
+    """
     host: str
     interface: str
     mac: str
+    _hash: int = field(default=0, init=False, repr=False, compare=False)
 
     def to_dict(self) -> Dict[str, str]:
-        return asdict(self)
+        return {"host": self.host, "interface": self.interface, "mac": self.mac}
 
     def __hash__(self):
-        return hash((self.host, self.interface))
+        h = self._hash
+        if not h:
+            h = hash((self.host, self.interface))
+            object.__setattr__(self, '_hash', h)
+        return h
 
     def __eq__(self, other):
         if not isinstance(other, Port):
@@ -33,7 +61,7 @@ class Port:
         return self.host == other.host and self.interface == other.interface
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class Link:
     """Represents a network link between two ports."""
     port_a: Port
@@ -57,7 +85,7 @@ class Link:
         )
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class HostInfo:
     """Summary of collected information for a host."""
     host_id: str
@@ -75,37 +103,95 @@ class HostInfo:
         }
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class Topology:
-    """Complete network topology."""
+    """
+    Complete network topology.
+
+    Lookups by host or interface go through indexes built by build_index(),
+    which also fixes the sorted host order used by the output formatters.
+    Links are treated as immutable once inferred; code that replaces or
+    edits them in place must call build_index() again. Each rebuild bumps
+    `version`, which the output formatters key their opt-in render cache on.
+    """
     hosts: Dict[str, HostInfo] = field(default_factory=dict)
     links: List[Link] = field(default_factory=list)
+    _port_index: Dict[Tuple[str, str], Link] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _host_index: Dict[str, List[Link]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _indexed_count: int = field(default=-1, init=False, repr=False, compare=False)
+    _sorted_hosts: Tuple[str, ...] = field(
+        default=(), init=False, repr=False, compare=False
+    )
+    version: int = field(default=0, init=False, repr=False, compare=False)
 
     def to_dict(self) -> Dict[str, Any]:
         return {
             "hosts": {h: info.to_dict() for h, info in self.hosts.items()},
             "links": [link.to_dict() for link in self.links],
-            "summary": {
-                "host_count": len(self.hosts),
-                "link_count": len(self.links),
-                "bidirectional_links": sum(1 for l in self.links if l.bidirectional),
-                "unidirectional_links": sum(1 for l in self.links if not l.bidirectional),
-            }
+            "summary": self.summary(),
         }
 
+    def summary(self) -> Dict[str, int]:
+        """Host and link counts, as in to_dict()["summary"]."""
+        bidirectional = 0
+        for link in self.links:
+            bidirectional += link.bidirectional
+        return {
+            "host_count": len(self.hosts),
+            "link_count": len(self.links),
+            "bidirectional_links": bidirectional,
+            "unidirectional_links": len(self.links) - bidirectional,
+        }
+
+    def build_index(self) -> None:
+        """Index links by (host, interface) and by host."""
+        port_index: Dict[Tuple[str, str], Link] = {}
+        host_index: Dict[str, List[Link]] = {}
+        for link in self.links:
+            a, b = link.port_a, link.port_b
+            # First link wins, matching the order of the old linear scan
+            port_index.setdefault((a.host, a.interface), link)
+            port_index.setdefault((b.host, b.interface), link)
+            host_index.setdefault(a.host, []).append(link)
+            if b.host != a.host:
+                host_index.setdefault(b.host, []).append(link)
+        self._port_index = port_index
+        self._host_index = host_index
+        self._indexed_count = len(self.links)
+        self._sorted_hosts = tuple(sorted(self.hosts))
+        self.version += 1
+
+    def _ensure_index(self) -> None:
+        # Cheap guard for topologies built by hand or extended by append
+        if self._indexed_count != len(self.links):
+            self.build_index()
+
+    def sorted_host_ids(self) -> Tuple[str, ...]:
+        """
+        Host IDs in sorted order.
+
+        The tuple from the last index build is reused while it still names
+        exactly the current hosts; a host added, removed or renamed since
+        then triggers a re-sort.
+        """
+        self._ensure_index()
+        if self.hosts.keys() != set(self._sorted_hosts):
+            self._sorted_hosts = tuple(sorted(self.hosts))
+        return self._sorted_hosts
+
     def get_links_for_host(self, host_id: str) -> List[Link]:
         """Get all links involving a specific host."""
-        return [
-            link for link in self.links
-            if link.port_a.host == host_id or link.port_b.host == host_id
-        ]
+        self._ensure_index()
+        return list(self._host_index.get(host_id, ()))
 
     def get_link_for_interface(self, host: str, interface: str) -> Optional[Link]:
         """Get the link for a specific interface, if any."""
-        for link in self.links:
-            if link.involves_port(host, interface):
-                return link
-        return None
+        self._ensure_index()
+        return self._port_index.get((host, interface))
 
 
 class TopologyInferrer:
@@ -120,8 +206,19 @@ class TopologyInferrer:
     """
 
     def __init__(self):
-        self._mac_to_port: Dict[str, Port] = {}
-        self._observed_links: Set[Tuple[str, str, str, str]] = set()
+        # Port table stored as parallel columns indexed by port ID. Port
+        # objects are only materialized for ports that end up in a link.
+        self._port_keys: List[Tuple[str, str]] = []  # (host, interface)
+        self._port_macs: List[str] = []
+        self._port_objs: List[Optional[Port]] = []
+        self._port_host_ids: List[int] = []
+        self._port_ids: Dict[Tuple[str, str], int] = {}
+        # Host names interned to small integers
+        self._host_ids: Dict[str, int] = {}
+        # Keyed by the 6-byte MAC form, see _mac_to_bytes()
+        self._mac_to_idx: Dict[bytes, int] = {}
+        # Directed observations packed as (local port ID << 32) | remote port ID
+        self._observed_links: Set[int] = set()
 
     def infer(self, host_data: Dict[str, Dict[str, Any]]) -> Topology:
         """
@@ -141,17 +238,90 @@ class TopologyInferrer:
         topology = Topology()
 
         # Phase 1: Build MAC-to-port mapping and collect host info
-        self._mac_to_port.clear()
+        self._port_keys.clear()
+        self._port_macs.clear()
+        self._port_objs.clear()
+        self._port_host_ids.clear()
+        self._port_ids.clear()
+        self._host_ids.clear()
+        self._mac_to_idx.clear()
         self._observed_links.clear()
 
         for host_id, data in host_data.items():
             host_info = self._process_host(host_id, data)
             topology.hosts[host_id] = host_info
 
-        logger.info(f"Built MAC mapping with {len(self._mac_to_port)} entries")
+        logger.info(f"Built MAC mapping with {len(self._mac_to_idx)} entries")
+
+        # Phase 2: Resolve neighbor observations to port IDs, then build links
+        rows = self._join_neighbors(host_data)
+
+        port_keys = self._port_keys
+        observed = self._observed_links
+        # Keyed by the two port IDs packed into one int, lower ID first
+        links_map: Dict[int, Link] = {}
+        # Each new link with the observation key of the opposite direction
+        # to the one that created it; only that one needs checking later
+        pending_reverse: List[Tuple[Link, int]] = []
+
+        for local_idx, remote_idx, discovery_method in rows:
+            if local_idx < remote_idx:
+                link_key = (local_idx << 32) | remote_idx
+            else:
+                link_key = (remote_idx << 32) | local_idx
+
+            link = links_map.get(link_key)
+            if link is None:
+                # Order the ends by (host, interface) for a stable port_a/port_b
+                if port_keys[local_idx] <= port_keys[remote_idx]:
+                    idx_a, idx_b = local_idx, remote_idx
+                else:
+                    idx_a, idx_b = remote_idx, local_idx
+                link = Link(
+                    port_a=self._get_port(idx_a),
+                    port_b=self._get_port(idx_b),
+                    bidirectional=False,
+                    discovery_methods=[discovery_method],
+                )
+                links_map[link_key] = link
+                pending_reverse.append((link, (remote_idx << 32) | local_idx))
+            elif discovery_method not in link.discovery_methods:
+                link.discovery_methods.append(discovery_method)
+
+            # Track observation direction for bidirectional detection
+            observed.add((local_idx << 32) | remote_idx)
+
+        # Phase 3: Mark bidirectional links. The direction that created a
+        # link is observed by construction, so only the reverse is probed.
+        for link, reverse in pending_reverse:
+            link.bidirectional = reverse in observed
+
+        topology.links = list(links_map.values())
+        topology.build_index()
+
+        logger.info(
+            f"Inferred topology: {len(topology.hosts)} hosts, "
+            f"{len(topology.links)} links "
+            f"({sum(1 for l in topology.links if l.bidirectional)} bidirectional)"
+        )
 
-        # Phase 2: Process neighbor observations to find links
-        links_map: Dict[Tuple[Port, Port], Link] = {}
+        return topology
+
+    def _join_neighbors(
+        self,
+        host_data: Dict[str, Dict[str, Any]]
+    ) -> List[Tuple[int, int, str]]:
+        """
+        Join neighbor observations against the port table.
+
+        Returns one (local port ID, remote port ID, discovery method) row
+        per neighbor whose MAC belongs to a port on another host. Hosts are
+        compared by interned integer ID rather than by name.
+        """
+        port_ids = self._port_ids
+        port_host_ids = self._port_host_ids
+        mac_to_idx = self._mac_to_idx
+        rows: List[Tuple[int, int, str]] = []
 
         for host_id, data in host_data.items():
             neighbors = data.get("neighbors", {})
@@ -161,16 +331,19 @@ class TopologyInferrer:
                 if iface not in interfaces:
                     continue
 
-                local_mac = self._get_interface_mac(interfaces, iface)
-                local_port = Port(host=host_id, interface=iface, mac=local_mac)
+                local_idx = port_ids.get((host_id, iface))
+                if local_idx is None:
+                    # Only interfaces without a MAC were left out of Phase 1
+                    local_idx = self._add_port(host_id, iface, "")
+                local_host = port_host_ids[local_idx]
 
                 for neighbor in neighbor_list:
                     remote_mac = neighbor.get("remote_mac", "")
                     if not remote_mac:
                         continue
 
-                    remote_port = self._mac_to_port.get(remote_mac)
-                    if not remote_port:
+                    remote_idx = mac_to_idx.get(_mac_to_bytes(remote_mac))
+                    if remote_idx is None:
                         logger.debug(
                             f"Unknown remote MAC {remote_mac} seen from "
                             f"{host_id}:{iface}"
@@ -178,50 +351,16 @@ class TopologyInferrer:
                         continue
 
                     # Skip self-references
-                    if remote_port.host == host_id:
+                    if port_host_ids[remote_idx] == local_host:
                         continue
 
-                    # Create or update link
-                    link_key = self._normalize_link_key(local_port, remote_port)
-                    discovery_method = neighbor.get("discovery_method", "unknown")
+                    rows.append((
+                        local_idx,
+                        remote_idx,
+                        neighbor.get("discovery_method", "unknown"),
+                    ))
 
-                    if link_key not in links_map:
-                        links_map[link_key] = Link(
-                            port_a=link_key[0],
-                            port_b=link_key[1],
-                            bidirectional=False,
-                            discovery_methods=[discovery_method],
-                        )
-                    else:
-                        link = links_map[link_key]
-                        if discovery_method not in link.discovery_methods:
-                            link.discovery_methods.append(discovery_method)
-
-                    # Track observation direction for bidirectional detection
-                    obs_key = (host_id, iface, remote_port.host, remote_port.interface)
-                    self._observed_links.add(obs_key)
-
-        # Phase 3: Mark bidirectional links
-        for link in links_map.values():
-            forward = (
-                link.port_a.host, link.port_a.interface,
-                link.port_b.host, link.port_b.interface
-            )
-            reverse = (
-                link.port_b.host, link.port_b.interface,
-                link.port_a.host, link.port_a.interface
-            )
-            link.bidirectional = forward in self._observed_links and reverse in self._observed_links
-
-        topology.links = list(links_map.values())
-
-        logger.info(
-            f"Inferred topology: {len(topology.hosts)} hosts, "
-            f"{len(topology.links)} links "
-            f"({sum(1 for l in topology.links if l.bidirectional)} bidirectional)"
-        )
-
-        return topology
+        return rows
 
     def _process_host(self, host_id: str, data: Dict[str, Any]) -> HostInfo:
         """Process a single host's data and update MAC mapping."""
@@ -237,39 +376,48 @@ class TopologyInferrer:
         for iface_name, iface_data in host_info.interfaces.items():
             mac = self._get_interface_mac_from_data(iface_data)
             if mac:
-                port = Port(host=host_id, interface=iface_name, mac=mac)
-                if mac in self._mac_to_port:
-                    existing = self._mac_to_port[mac]
+                idx = self._add_port(host_id, iface_name, mac)
+                mac_key = _mac_to_bytes(mac)
+                existing = self._mac_to_idx.get(mac_key)
+                if existing is not None:
+                    existing_host, existing_iface = self._port_keys[existing]
                     logger.warning(
-                        f"Duplicate MAC {mac}: {existing.host}:{existing.interface} "
+                        f"Duplicate MAC {mac}: {existing_host}:{existing_iface} "
                         f"and {host_id}:{iface_name}"
                     )
-                self._mac_to_port[mac] = port
+                self._mac_to_idx[mac_key] = idx
 
         return host_info
 
-    def _get_interface_mac(self, interfaces: Dict[str, Any], iface: str) -> str:
-        """Get MAC address for an interface from interfaces dict."""
-        iface_data = interfaces.get(iface)
-        return self._get_interface_mac_from_data(iface_data)
+    def _add_port(self, host: str, interface: str, mac: str) -> int:
+        """Append a port to the port columns and return its ID."""
+        key = (host, interface)
+        idx = len(self._port_keys)
+        self._port_keys.append(key)
+        self._port_macs.append(mac)
+        self._port_objs.append(None)
+        self._port_host_ids.append(self._host_ids.setdefault(host, len(self._host_ids)))
+        self._port_ids[key] = idx
+        return idx
+
+    def _get_port(self, idx: int) -> Port:
+        """Materialize (once) the Port object for a port ID."""
+        port = self._port_objs[idx]
+        if port is None:
+            host, interface = self._port_keys[idx]
+            port = Port(host=host, interface=interface, mac=self._port_macs[idx])
+            self._port_objs[idx] = port
+        return port
 
     def _get_interface_mac_from_data(self, iface_data: Any) -> str:
-        """Extract MAC address from interface data (dict or object)."""
-        if iface_data is None:
-            return ""
-        if isinstance(iface_data, dict):
-            return iface_data.get("mac", "").lower()
-        if hasattr(iface_data, "mac"):
-            return getattr(iface_data, "mac", "").lower()
-        return ""
-
-    def _normalize_link_key(self, port_a: Port, port_b: Port) -> Tuple[Port, Port]:
         """
-        Normalize link key to ensure consistent ordering.
-        Orders by (host, interface) to avoid duplicate links.
+        Extract the lowercased MAC address from interface data (dict or object).
+
+        Called once per interface in Phase 1; Phase 2 reuses the port
+        columns instead of normalizing the MAC again.
         """
-        key_a = (port_a.host, port_a.interface)
-        key_b = (port_b.host, port_b.interface)
-        if key_a <= key_b:
-            return (port_a, port_b)
-        return (port_b, port_a)
+        if isinstance(iface_data, dict):
+            mac = iface_data.get("mac")
+        else:
+            mac = getattr(iface_data, "mac", None)
+        return mac.lower() if mac else ""
@@ -9,15 +9,26 @@ Validates the inferred topology and collected data for:
 """
 
 import logging
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass, asdict
+import sys
+from collections import Counter
+from functools import partial
+from typing import Callable, Dict, List, Any, Optional, Tuple
+from dataclasses import dataclass, field
+from operator import attrgetter
 
 from .infer import Topology, Link
 
 logger = logging.getLogger(__name__)
 
+# Python 3.10+ gets a __slots__ layout, dropping the per-instance __dict__
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+# Sort rank per severity: error first, then warning, then info
+_SEVERITY_RANK = {"error": 0, "warning": 1, "info": 2}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class ValidationIssue:
     """Represents a validation issue found in the topology."""
     severity: str  # "error", "warning", "info"
@@ -25,11 +36,20 @@ class ValidationIssue:
     interface: str
     message: str
     details: Optional[Dict[str, Any]] = None
+    severity_rank: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.severity_rank = _SEVERITY_RANK.get(self.severity, 3)
 
     def to_dict(self) -> Dict[str, Any]:
-        result = asdict(self)
-        if result["details"] is None:
-            del result["details"]
+        result = {
+            "severity": self.severity,
+            "host": self.host,
+            "interface": self.interface,
+            "message": self.message,
+        }
+        if self.details is not None:
+            result["details"] = self.details
         return result
 
 
@@ -79,215 +99,201 @@ class TopologyValidator:
         Returns:
             List of validation issues found
         """
-        issues: List[ValidationIssue] = []
-
-        # Check for unidirectional links
-        issues.extend(self._check_unidirectional_links(topology))
+        unidirectional: List[ValidationIssue] = []
+        mismatches: List[ValidationIssue] = []
+        no_link: List[ValidationIssue] = []
+        counters: List[ValidationIssue] = []
 
-        # Check for speed/duplex mismatches
-        issues.extend(self._check_link_mismatches(topology, raw_data))
+        # One sweep over the links and one over the hosts. Each check keeps
+        # its own list so the pre-sort order matches the separate passes.
+        self._check_links(topology, raw_data, unidirectional, mismatches)
+        self._check_host_interfaces(topology, raw_data, no_link, counters)
 
-        # Check for interfaces without links
-        issues.extend(self._check_no_link_detected(topology, raw_data))
-
-        # Check error counters
-        issues.extend(self._check_error_counters(raw_data))
+        issues = unidirectional + mismatches + no_link + counters
 
         # Sort by severity (error first, then warning, then info)
-        severity_order = {"error": 0, "warning": 1, "info": 2}
-        issues.sort(key=lambda x: (severity_order.get(x.severity, 3), x.host, x.interface))
+        issues.sort(key=attrgetter("severity_rank", "host", "interface"))
 
+        severity_counts = Counter(i.severity for i in issues)
         logger.info(
             f"Validation complete: {len(issues)} issues "
-            f"({sum(1 for i in issues if i.severity == 'error')} errors, "
-            f"{sum(1 for i in issues if i.severity == 'warning')} warnings)"
+            f"({severity_counts['error']} errors, "
+            f"{severity_counts['warning']} warnings)"
         )
 
         return issues
 
-    def _check_unidirectional_links(self, topology: Topology) -> List[ValidationIssue]:
-        """Check for links where only one side sees the other."""
-        issues = []
-
-        for link in topology.links:
-            if not link.bidirectional:
-                issues.append(ValidationIssue(
-                    severity="warning",
-                    host=link.port_a.host,
-                    interface=link.port_a.interface,
-                    message=(
-                        f"Unidirectional link to {link.port_b.host}:{link.port_b.interface} - "
-                        f"only one side observes the connection"
-                    ),
-                    details={
-                        "remote_host": link.port_b.host,
-                        "remote_interface": link.port_b.interface,
-                        "discovery_methods": link.discovery_methods,
-                    }
-                ))
-
-        return issues
-
-    def _check_link_mismatches(
+    def _check_links(
         self,
         topology: Topology,
-        raw_data: Dict[str, Dict[str, Any]]
-    ) -> List[ValidationIssue]:
-        """Check for speed/duplex mismatches between link endpoints."""
-        issues = []
+        raw_data: Dict[str, Dict[str, Any]],
+        unidirectional: List[ValidationIssue],
+        mismatches: List[ValidationIssue]
+    ) -> None:
+        """Check every link for unidirectionality and speed/duplex mismatches."""
+        # Endpoint states memoized per port; a port shared by several links
+        # is looked up (and converted with to_dict()) only once
+        states: Dict[Tuple[str, str], Optional[Dict[str, Any]]] = {}
+
+        def state_of(host: str, interface: str) -> Optional[Dict[str, Any]]:
+            key = (host, interface)
+            if key in states:
+                return states[key]
+            state = states[key] = self._get_link_state(raw_data, host, interface)
+            return state
 
         for link in topology.links:
-            port_a_state = self._get_link_state(
-                raw_data, link.port_a.host, link.port_a.interface
-            )
-            port_b_state = self._get_link_state(
-                raw_data, link.port_b.host, link.port_b.interface
-            )
-
-            if not port_a_state or not port_b_state:
-                continue
-
-            # Check speed mismatch
-            speed_a = port_a_state.get("speed", "")
-            speed_b = port_b_state.get("speed", "")
-
-            if speed_a and speed_b and speed_a != speed_b:
-                issues.append(ValidationIssue(
-                    severity="warning",
-                    host=link.port_a.host,
-                    interface=link.port_a.interface,
-                    message=(
-                        f"Speed mismatch with {link.port_b.host}:{link.port_b.interface}: "
-                        f"{speed_a} vs {speed_b}"
-                    ),
-                    details={
-                        "local_speed": speed_a,
-                        "remote_speed": speed_b,
-                        "remote_host": link.port_b.host,
-                        "remote_interface": link.port_b.interface,
-                    }
-                ))
+            if not link.bidirectional:
+                unidirectional.append(self._unidirectional_issue(link))
 
-            # Check duplex mismatch
-            duplex_a = port_a_state.get("duplex", "")
-            duplex_b = port_b_state.get("duplex", "")
-
-            if duplex_a and duplex_b and duplex_a != duplex_b:
-                issues.append(ValidationIssue(
-                    severity="warning",
-                    host=link.port_a.host,
-                    interface=link.port_a.interface,
-                    message=(
-                        f"Duplex mismatch with {link.port_b.host}:{link.port_b.interface}: "
-                        f"{duplex_a} vs {duplex_b}"
-                    ),
-                    details={
-                        "local_duplex": duplex_a,
-                        "remote_duplex": duplex_b,
-                        "remote_host": link.port_b.host,
-                        "remote_interface": link.port_b.interface,
-                    }
-                ))
+            port_a_state = state_of(link.port_a.host, link.port_a.interface)
+            if not port_a_state:
+                continue
+            port_b_state = state_of(link.port_b.host, link.port_b.interface)
+            if not port_b_state:
+                continue
 
-        return issues
+            self._check_link_mismatches(link, port_a_state, port_b_state, mismatches)
 
-    def _check_no_link_detected(
+    def _check_host_interfaces(
         self,
         topology: Topology,
-        raw_data: Dict[str, Dict[str, Any]]
-    ) -> List[ValidationIssue]:
-        """Check for interfaces that are up but have no detected link."""
-        issues = []
-
+        raw_data: Dict[str, Dict[str, Any]],
+        no_link: List[ValidationIssue],
+        counters: List[ValidationIssue]
+    ) -> None:
+        """Check each host's interfaces for missing links and error counters."""
         for host_id, data in raw_data.items():
             interfaces = data.get("interfaces", {})
             link_states = data.get("link_states", {})
 
             for iface_name, iface_data in interfaces.items():
-                # Get interface state
-                state = self._get_value(iface_data, "state", "unknown")
-                if state != "up":
-                    continue
-
-                # Check if link is detected
                 link_state = link_states.get(iface_name, {})
-                link_detected = self._get_value(link_state, "link_detected", False)
-                carrier = self._get_value(link_state, "carrier", False)
-
-                if not link_detected and not carrier:
+                if self._is_up_without_link(iface_data, link_state):
                     # Check if there's a topology link for this interface
-                    has_topo_link = topology.get_link_for_interface(host_id, iface_name) is not None
-
-                    if not has_topo_link:
-                        issues.append(ValidationIssue(
+                    if topology.get_link_for_interface(host_id, iface_name) is None:
+                        no_link.append(ValidationIssue(
                             severity="info",
                             host=host_id,
                             interface=iface_name,
                             message="Interface is up but no link detected and no neighbors found",
                         ))
 
-        return issues
+            for iface_name, link_state in link_states.items():
+                self._check_error_counters(host_id, iface_name, link_state, counters)
+
+    def _unidirectional_issue(self, link: Link) -> ValidationIssue:
+        """Build the issue for a link where only one side sees the other."""
+        return ValidationIssue(
+            severity="warning",
+            host=link.port_a.host,
+            interface=link.port_a.interface,
+            message=(
+                f"Unidirectional link to {link.port_b.host}:{link.port_b.interface} - "
+                f"only one side observes the connection"
+            ),
+            details={
+                "remote_host": link.port_b.host,
+                "remote_interface": link.port_b.interface,
+                "discovery_methods": link.discovery_methods,
+            }
+        )
 
-    def _check_error_counters(
+    def _check_link_mismatches(
         self,
-        raw_data: Dict[str, Dict[str, Any]]
-    ) -> List[ValidationIssue]:
-        """Check for interfaces with high error counters."""
-        issues = []
+        link: Link,
+        port_a_state: Dict[str, Any],
+        port_b_state: Dict[str, Any],
+        issues: List[ValidationIssue]
+    ) -> None:
+        """Check for speed/duplex mismatches between link endpoints."""
+        for key, label in (("speed", "Speed"), ("duplex", "Duplex")):
+            value_a = port_a_state.get(key, "")
+            value_b = port_b_state.get(key, "")
+            if value_a and value_b and value_a != value_b:
+                issues.append(self._mismatch_issue(link, key, label, value_a, value_b))
 
-        for host_id, data in raw_data.items():
-            link_states = data.get("link_states", {})
+    def _mismatch_issue(
+        self,
+        link: Link,
+        key: str,
+        label: str,
+        local_value: Any,
+        remote_value: Any
+    ) -> ValidationIssue:
+        """Build a speed/duplex mismatch issue reported on port_a."""
+        remote = link.port_b
+        return ValidationIssue(
+            severity="warning",
+            host=link.port_a.host,
+            interface=link.port_a.interface,
+            message=(
+                f"{label} mismatch with {remote.host}:{remote.interface}: "
+                f"{local_value} vs {remote_value}"
+            ),
+            details={
+                f"local_{key}": local_value,
+                f"remote_{key}": remote_value,
+                "remote_host": remote.host,
+                "remote_interface": remote.interface,
+            }
+        )
 
-            for iface_name, link_state in link_states.items():
-                stats = self._get_value(link_state, "stats", {})
-                if not stats:
-                    continue
-
-                # Check RX errors
-                rx_errors = self._get_value(stats, "rx_errors", 0)
-                if rx_errors > self.error_threshold:
-                    issues.append(ValidationIssue(
-                        severity="warning",
-                        host=host_id,
-                        interface=iface_name,
-                        message=f"High RX error count: {rx_errors}",
-                        details={"rx_errors": rx_errors, "threshold": self.error_threshold},
-                    ))
-
-                # Check TX errors
-                tx_errors = self._get_value(stats, "tx_errors", 0)
-                if tx_errors > self.error_threshold:
-                    issues.append(ValidationIssue(
-                        severity="warning",
-                        host=host_id,
-                        interface=iface_name,
-                        message=f"High TX error count: {tx_errors}",
-                        details={"tx_errors": tx_errors, "threshold": self.error_threshold},
-                    ))
-
-                # Check RX dropped
-                rx_dropped = self._get_value(stats, "rx_dropped", 0)
-                if rx_dropped > self.dropped_threshold:
-                    issues.append(ValidationIssue(
-                        severity="info",
-                        host=host_id,
-                        interface=iface_name,
-                        message=f"High RX dropped count: {rx_dropped}",
-                        details={"rx_dropped": rx_dropped, "threshold": self.dropped_threshold},
-                    ))
-
-                # Check TX dropped
-                tx_dropped = self._get_value(stats, "tx_dropped", 0)
-                if tx_dropped > self.dropped_threshold:
-                    issues.append(ValidationIssue(
-                        severity="info",
-                        host=host_id,
-                        interface=iface_name,
-                        message=f"High TX dropped count: {tx_dropped}",
-                        details={"tx_dropped": tx_dropped, "threshold": self.dropped_threshold},
-                    ))
+    def _is_up_without_link(self, iface_data: Any, link_state: Any) -> bool:
+        """Check whether an interface is up but reports neither link nor carrier."""
+        state = self._get_value(iface_data, "state", "unknown")
+        if state != "up":
+            return False
 
-        return issues
+        get = self._getter(link_state)
+        return not get("link_detected", False) and not get("carrier", False)
+
+    def _check_error_counters(
+        self,
+        host_id: str,
+        iface_name: str,
+        link_state: Any,
+        issues: List[ValidationIssue]
+    ) -> None:
+        """Check an interface for high error counters."""
+        stats = self._get_value(link_state, "stats", {})
+        if not stats:
+            return
+        get = self._getter(stats)
+
+        error_threshold = self.error_threshold
+        dropped_threshold = self.dropped_threshold
+
+        for key, label, severity, threshold in (
+            ("rx_errors", "High RX error count", "warning", error_threshold),
+            ("tx_errors", "High TX error count", "warning", error_threshold),
+            ("rx_dropped", "High RX dropped count", "info", dropped_threshold),
+            ("tx_dropped", "High TX dropped count", "info", dropped_threshold),
+        ):
+            value = get(key, 0)
+            if value > threshold:
+                issues.append(self._counter_issue(
+                    severity, host_id, iface_name, key, label, value, threshold
+                ))
+
+    def _counter_issue(
+        self,
+        severity: str,
+        host: str,
+        interface: str,
+        key: str,
+        label: str,
+        value: int,
+        threshold: int
+    ) -> ValidationIssue:
+        """Build an issue for a counter above its threshold."""
+        return ValidationIssue(
+            severity=severity,
+            host=host,
+            interface=interface,
+            message=f"{label}: {value}",
+            details={key: value, "threshold": threshold},
+        )
 
     def _get_link_state(
         self,
@@ -315,12 +321,24 @@ class TopologyValidator:
 
     def _get_value(self, data: Any, key: str, default: Any = None) -> Any:
         """Get a value from dict or object."""
-        if data is None:
-            return default
+        # Data loaded from JSON/YAML is all dicts, so test that first
         if isinstance(data, dict):
             return data.get(key, default)
+        if data is None:
+            return default
         if hasattr(data, key):
             return getattr(data, key, default)
         if hasattr(data, "to_dict"):
             return data.to_dict().get(key, default)
         return default
+
+    def _getter(self, data: Any) -> Callable[[str, Any], Any]:
+        """
+        Return a (key, default) accessor for data, resolving its type once.
+
+        Dicts get their bound .get, so repeated lookups on the same record
+        skip the type probes in _get_value.
+        """
+        if isinstance(data, dict):
+            return data.get
+        return partial(self._get_value, data)
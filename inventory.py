@@ -6,13 +6,28 @@ merging defaults with per-host settings.
 """
 
 import os
+import re
 import logging
+import pickle
 from typing import Dict, List, Any, Optional
 
 import yaml
 
+# Prefer the libyaml-backed loader; PyYAML builds without libyaml only
+# ship the pure-Python one
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
 logger = logging.getLogger(__name__)
 
+# Set to a non-empty value to disable the processed-inventory cache
+CACHE_DISABLE_ENV = "NETCONFIG_NO_INVENTORY_CACHE"
+CACHE_SUFFIX = ".cache.pkl"
+# Bump when the processed inventory layout changes
+_CACHE_VERSION = 2
+
 
 class InventoryError(Exception):
     """Exception raised for inventory loading errors."""
@@ -23,6 +38,10 @@ def load_inventory(path: str) -> Dict[str, Any]:
     """
     Load and parse the inventory configuration file.
 
+    The processed result is cached next to the file as <path>.cache.pkl,
+    keyed by the file's mtime and size. Set NETCONFIG_NO_INVENTORY_CACHE
+    to disable the cache.
+
     Args:
         path: Path to the hosts.yaml file
 
@@ -30,6 +49,8 @@ def load_inventory(path: str) -> Dict[str, Any]:
         Dictionary containing:
         - hosts: Dict of host configurations with defaults merged
         - exclude_interfaces: List of interface exclusion patterns
+        - exclude_interfaces_re: The patterns compiled into one regex,
+          or None if there are none
 
     Raises:
         InventoryError: If file cannot be loaded or parsed
@@ -39,9 +60,17 @@ def load_inventory(path: str) -> Dict[str, Any]:
     if not os.path.isfile(path):
         raise InventoryError(f"Inventory file not found: {path}")
 
+    use_cache = not os.environ.get(CACHE_DISABLE_ENV)
+    if use_cache:
+        st = os.stat(path)
+        cache_key = (_CACHE_VERSION, st.st_mtime_ns, st.st_size)
+        cached = _read_cache(path + CACHE_SUFFIX, cache_key)
+        if cached is not None:
+            return cached
+
     try:
         with open(path, "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f)
+            data = yaml.load(f, Loader=_SafeLoader)
     except yaml.YAMLError as e:
         raise InventoryError(f"Failed to parse inventory file: {e}")
     except IOError as e:
@@ -50,7 +79,52 @@ def load_inventory(path: str) -> Dict[str, Any]:
     if not data:
         raise InventoryError("Inventory file is empty")
 
-    return _process_inventory(data)
+    inventory = _process_inventory(data)
+
+    if use_cache:
+        _write_cache(path + CACHE_SUFFIX, cache_key, inventory)
+
+    return inventory
+
+
+def _read_cache(cache_path: str, cache_key: tuple) -> Optional[Dict[str, Any]]:
+    """
+    Load a processed inventory cached for the given (version, mtime, size) key.
+
+    Only cache files owned by the current user are trusted, since
+    unpickling can execute code. Any problem reading the cache is treated
+    as a miss.
+    """
+    try:
+        st = os.stat(cache_path)
+        if hasattr(os, "getuid") and st.st_uid != os.getuid():
+            return None
+        with open(cache_path, "rb") as f:
+            key, inventory = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.debug(f"Ignoring unreadable inventory cache {cache_path}: {e}")
+        return None
+
+    return inventory if key == cache_key else None
+
+
+def _write_cache(cache_path: str, cache_key: tuple, inventory: Dict[str, Any]) -> None:
+    """Write the processed inventory cache, ignoring failures."""
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        # The inventory may hold passwords, so keep the cache private
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump((cache_key, inventory), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.debug(f"Could not write inventory cache {cache_path}: {e}")
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
 
 
 def _process_inventory(data: Dict[str, Any]) -> Dict[str, Any]:
@@ -105,9 +179,31 @@ def _process_inventory(data: Dict[str, Any]) -> Dict[str, Any]:
     return {
         "hosts": hosts,
         "exclude_interfaces": exclude_interfaces,
+        "exclude_interfaces_re": compile_exclude_patterns(exclude_interfaces),
     }
 
 
+def compile_exclude_patterns(patterns: List[str]) -> Optional[re.Pattern]:
+    """
+    Combine interface exclusion regexes into a single compiled pattern.
+
+    Args:
+        patterns: Regular expressions matched against interface names
+
+    Returns:
+        One alternation matching any of the patterns, or None if empty
+
+    Raises:
+        InventoryError: If a pattern is not a valid regular expression
+    """
+    if not patterns:
+        return None
+    try:
+        return re.compile("|".join(f"(?:{p})" for p in patterns))
+    except re.error as e:
+        raise InventoryError(f"Invalid exclude_interfaces pattern: {e}")
+
+
 def get_host_ssh_config(inventory: Dict[str, Any], host_id: str) -> Dict[str, Any]:
     """
     Extract SSH connection parameters for a specific host.
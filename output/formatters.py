@@ -5,17 +5,114 @@ Provides functions to format topology and validation results
 for different output formats.
 """
 
+import io
 import json
 import logging
-from collections import defaultdict
-from typing import List, Optional, TextIO, Dict, Set, Tuple
+import threading
+from collections import Counter, OrderedDict
+from operator import attrgetter
+from typing import Any, BinaryIO, Callable, List, Optional, TextIO, Dict, Sequence, Set, Tuple
 from pathlib import Path
 
 from engine.infer import Topology, Link
 from engine.validate import ValidationIssue
 
+try:
+    import orjson
+except ImportError:  # optional accelerator, see the "fast" extra
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Fixed rules and section frames, built once at import
+_RULE_EQ_60 = "=" * 60
+_RULE_DASH_40 = "-" * 40
+_BORDER_EQ_62 = "═" * 62
+_BORDER_DASH_62 = "─" * 62
+_SUBSECTION_RULE = "  " + "─" * 50
+
+
+def _section_box(title: str) -> str:
+    """Three-line box framing a centered section title, newline-terminated."""
+    return (
+        "┌" + _BORDER_DASH_62 + "┐\n"
+        "│" + title.center(62) + "│\n"
+        "└" + _BORDER_DASH_62 + "┘\n"
+    )
+
+
+_TITLE_BOX = (
+    "╔" + _BORDER_EQ_62 + "╗\n"
+    "║" + "NETWORK TOPOLOGY".center(62) + "║\n"
+    "╚" + _BORDER_EQ_62 + "╝\n"
+)
+_MATRIX_BOX = _section_box("CONNECTION MATRIX")
+_LINK_DIAGRAM_BOX = _section_box("LINK DIAGRAM")
+_ISSUES_BOX = _section_box("VALIDATION ISSUES")
+
+# Per-severity labels for to_text, format_issues and to_ascii
+_SEVERITY_MARKERS = {"error": "[ERROR]", "warning": "[WARN]", "info": "[INFO]"}
+_SEVERITY_PREFIXES = {"error": "ERROR", "warning": "WARN", "info": "INFO"}
+_SEVERITY_ICONS = {"error": "✗", "warning": "⚠", "info": "ℹ"}
+
+
+# Recently rendered reports for to_text/to_ascii(..., cache=True), keyed by
+# format and topology/issues identity. Entries hold references to their
+# inputs so a recycled id() can never match a different object; this also
+# keeps up to _FORMAT_CACHE_SIZE topologies and issue lists alive.
+_FORMAT_CACHE_SIZE = 4
+_format_cache: "OrderedDict[tuple, Tuple[Topology, Any, str]]" = OrderedDict()
+_format_cache_lock = threading.Lock()
+
+
+def _cached_render(
+    kind: str,
+    topology: Topology,
+    issues: Optional[List[ValidationIssue]],
+    render: Callable[[Topology, Optional[List[ValidationIssue]]], str]
+) -> str:
+    """
+    Return a cached rendering of (topology, issues), rendering on a miss.
+
+    The key includes topology.version (bumped by Topology.build_index())
+    and the host, link and issue counts. In-place edits that keep the
+    counts are not detected, so callers opting into the cache must call
+    build_index() after changing the topology and pass a new issues list
+    rather than editing the old one.
+    """
+    key = (
+        kind,
+        id(topology), topology.version, len(topology.hosts), len(topology.links),
+        id(issues), -1 if issues is None else len(issues),
+    )
+    with _format_cache_lock:
+        entry = _format_cache.get(key)
+        if entry is not None and entry[0] is topology and entry[1] is issues:
+            _format_cache.move_to_end(key)
+            return entry[2]
+
+    text = render(topology, issues)
+
+    with _format_cache_lock:
+        _format_cache[key] = (topology, issues, text)
+        while len(_format_cache) > _FORMAT_CACHE_SIZE:
+            _format_cache.popitem(last=False)
+
+    return text
+
+
+def _json_default(obj):
+    """
+    Serialize values the JSON encoders don't handle natively.
+
+    Objects with a to_dict() method (e.g. collector dataclasses) are
+    expanded; anything else (unit-carrying values and the like) is
+    written as its str() form rather than failing the whole export.
+    """
+    if hasattr(obj, "to_dict"):
+        return obj.to_dict()
+    return str(obj)
+
 
 def to_json(
     topology: Topology,
@@ -26,33 +123,125 @@ def to_json(
     """
     Write topology to a JSON file.
 
+    The document is streamed one host, link or issue at a time, so the
+    whole topology is never held as a nested dict. The output is the same
+    as dumping topology.to_dict() plus the validation fields.
+
     Args:
         topology: Topology object to serialize
         path: Output file path
         issues: Optional list of validation issues to include
-        indent: JSON indentation level
+        indent: JSON indentation level. orjson, when installed, is used
+            for indent=2 and compact (None) output.
     """
-    output = topology.to_dict()
+    summary = topology.summary()
+    sections = [
+        ("hosts", "{", ((h, info.to_dict()) for h, info in topology.hosts.items())),
+        ("links", "[", (link.to_dict() for link in topology.links)),
+        ("summary", None, summary),
+    ]
 
     if issues is not None:
-        output["validation_issues"] = [issue.to_dict() for issue in issues]
-        output["summary"]["issue_count"] = len(issues)
-        output["summary"]["error_count"] = sum(1 for i in issues if i.severity == "error")
-        output["summary"]["warning_count"] = sum(1 for i in issues if i.severity == "warning")
+        severity_counts = Counter(i.severity for i in issues)
+        summary["issue_count"] = len(issues)
+        summary["error_count"] = severity_counts["error"]
+        summary["warning_count"] = severity_counts["warning"]
+        sections.append(
+            ("validation_issues", "[", (issue.to_dict() for issue in issues))
+        )
 
     path_obj = Path(path)
     path_obj.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(output, f, indent=indent, ensure_ascii=False)
+    if orjson is not None and indent in (2, None):
+        # OPT_NON_STR_KEYS matches the stdlib's coercion of int/bool keys
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+
+        def dumps(obj: Any) -> bytes:
+            return orjson.dumps(obj, default=_json_default, option=option)
+
+        # orjson's compact form has no spaces after separators
+        compact_seps = (b",", b":")
+    else:
+        def dumps(obj: Any) -> bytes:
+            return json.dumps(
+                obj, indent=indent, ensure_ascii=False, default=_json_default
+            ).encode("utf-8")
+
+        compact_seps = (b", ", b": ")
+
+    # orjson already produces UTF-8, so the file is written in binary mode
+    # rather than through a text-mode encoder
+    with open(path, "wb") as f:
+        _write_json_stream(f, sections, indent, dumps, compact_seps)
 
     logger.info(f"Topology written to {path}")
 
 
+def _write_json_stream(
+    f: BinaryIO,
+    sections: List[Tuple[str, Optional[str], Any]],
+    indent: Optional[int],
+    dumps: Callable[[Any], bytes],
+    compact_seps: Tuple[bytes, bytes]
+) -> None:
+    """
+    Write a top-level JSON object section by section.
+
+    Each section is (key, opener, payload). An opener of "{" streams
+    (key, value) pairs from payload, "[" streams its items, and None
+    dumps payload as a single value. Layout matches json.dump with the
+    same indent, so nested values are re-indented by their depth.
+    Everything is written as UTF-8 bytes.
+    """
+    if indent is not None:
+        nl1 = b"\n" + b" " * indent
+        nl2 = nl1 + b" " * indent
+        item_sep, key_sep = b",", b": "
+    else:
+        nl1 = nl2 = b""
+        item_sep, key_sep = compact_seps
+
+    def nested(obj: Any, newline: bytes) -> bytes:
+        # Encoded strings never contain raw newlines, so this only
+        # touches layout
+        data = dumps(obj)
+        return data.replace(b"\n", newline) if indent is not None else data
+
+    f.write(b"{")
+    for i, (key, opener, payload) in enumerate(sections):
+        if i:
+            f.write(item_sep)
+        f.write(nl1 + dumps(key) + key_sep)
+
+        if opener is None:
+            f.write(nested(payload, nl1))
+            continue
+
+        f.write(opener.encode())
+        empty = True
+        for item in payload:
+            f.write(nl2 if empty else item_sep + nl2)
+            if opener == "{":
+                item_key, value = item
+                f.write(dumps(item_key) + key_sep + nested(value, nl2))
+            else:
+                f.write(nested(item, nl2))
+            empty = False
+        if not empty:
+            f.write(nl1)
+        f.write(b"}" if opener == "{" else b"]")
+
+    f.write(b"\n}" if indent is not None else b"}")
+
+
 def to_text(
     topology: Topology,
     issues: Optional[List[ValidationIssue]] = None,
-    file: Optional[TextIO] = None
+    file: Optional[TextIO] = None,
+    cache: bool = False
 ) -> str:
     """
     Format topology as human-readable text.
@@ -61,85 +250,96 @@ def to_text(
         topology: Topology object to format
         issues: Optional list of validation issues
         file: Optional file to write to
+        cache: Reuse the text from an earlier call with the same,
+            unchanged topology and issues (see _cached_render())
 
     Returns:
         Formatted text string
     """
-    lines = []
+    if cache:
+        text = _cached_render("text", topology, issues, _render_text)
+    else:
+        text = _render_text(topology, issues)
 
-    # Header
-    lines.append("=" * 60)
-    lines.append("NETWORK TOPOLOGY REPORT")
-    lines.append("=" * 60)
-    lines.append("")
+    if file is not None:
+        file.write(text)
 
-    # Summary
-    summary = topology.to_dict()["summary"]
-    lines.append("SUMMARY")
-    lines.append("-" * 40)
-    lines.append(f"  Hosts:              {summary['host_count']}")
-    lines.append(f"  Total Links:        {summary['link_count']}")
-    lines.append(f"  Bidirectional:      {summary['bidirectional_links']}")
-    lines.append(f"  Unidirectional:     {summary['unidirectional_links']}")
-    lines.append("")
+    return text
+
+
+def _render_text(
+    topology: Topology,
+    issues: Optional[List[ValidationIssue]]
+) -> str:
+    """Render the to_text() report."""
+    buf = io.StringIO()
+    write = buf.write
+
+    # Header and summary
+    summary = topology.summary()
+    write(
+        f"{_RULE_EQ_60}\n"
+        f"NETWORK TOPOLOGY REPORT\n"
+        f"{_RULE_EQ_60}\n"
+        f"\n"
+        f"SUMMARY\n"
+        f"{_RULE_DASH_40}\n"
+        f"  Hosts:              {summary['host_count']}\n"
+        f"  Total Links:        {summary['link_count']}\n"
+        f"  Bidirectional:      {summary['bidirectional_links']}\n"
+        f"  Unidirectional:     {summary['unidirectional_links']}\n"
+        f"\n"
+    )
 
     # Hosts
-    lines.append("HOSTS")
-    lines.append("-" * 40)
-    for host_id, host_info in sorted(topology.hosts.items()):
+    write("HOSTS\n")
+    write(_RULE_DASH_40 + "\n")
+    hosts = topology.hosts
+    for host_id in topology.sorted_host_ids():
+        host_info = hosts[host_id]
         iface_count = len(host_info.interfaces)
-        lines.append(f"  {host_id} ({host_info.hostname})")
-        lines.append(f"    Interfaces: {iface_count}")
+        write(f"  {host_id} ({host_info.hostname})\n")
+        write(f"    Interfaces: {iface_count}\n")
 
         # List interfaces with their MACs
         for iface_name, iface_data in sorted(host_info.interfaces.items()):
             mac = _get_mac(iface_data)
             state = _get_state(iface_data)
-            lines.append(f"      - {iface_name}: {mac} ({state})")
+            write(f"      - {iface_name}: {mac} ({state})\n")
 
-    lines.append("")
+    write("\n")
 
     # Links
-    lines.append("LINKS")
-    lines.append("-" * 40)
+    write("LINKS\n")
+    write(_RULE_DASH_40 + "\n")
     if topology.links:
         for link in topology.links:
+            pa, pb = link.port_a, link.port_b
             direction = "<-->" if link.bidirectional else "--->"
             methods = ", ".join(link.discovery_methods)
-            lines.append(
-                f"  {link.port_a.host}:{link.port_a.interface} "
-                f"{direction} "
-                f"{link.port_b.host}:{link.port_b.interface}"
+            write(
+                f"  {pa.host}:{pa.interface} {direction} {pb.host}:{pb.interface}\n"
+                f"    Discovered via: {methods}\n"
             )
-            lines.append(f"    Discovered via: {methods}")
     else:
-        lines.append("  No links discovered")
-    lines.append("")
+        write("  No links discovered\n")
+    write("\n")
 
     # Validation issues
     if issues:
-        lines.append("VALIDATION ISSUES")
-        lines.append("-" * 40)
+        write("VALIDATION ISSUES\n")
+        write(_RULE_DASH_40 + "\n")
         for issue in issues:
-            severity_marker = {
-                "error": "[ERROR]",
-                "warning": "[WARN]",
-                "info": "[INFO]"
-            }.get(issue.severity, "[?]")
+            severity_marker = _SEVERITY_MARKERS.get(issue.severity, "[?]")
 
-            lines.append(f"  {severity_marker} {issue.host}:{issue.interface}")
-            lines.append(f"    {issue.message}")
-        lines.append("")
+            write(f"  {severity_marker} {issue.host}:{issue.interface}\n")
+            write(f"    {issue.message}\n")
+        write("\n")
 
     # Footer
-    lines.append("=" * 60)
-
-    text = "\n".join(lines)
-
-    if file is not None:
-        file.write(text)
+    write(_RULE_EQ_60)
 
-    return text
+    return buf.getvalue()
 
 
 def format_issues(issues: List[ValidationIssue]) -> str:
@@ -157,46 +357,56 @@ def format_issues(issues: List[ValidationIssue]) -> str:
 
     lines = []
 
-    error_count = sum(1 for i in issues if i.severity == "error")
-    warning_count = sum(1 for i in issues if i.severity == "warning")
-    info_count = sum(1 for i in issues if i.severity == "info")
+    severity_counts = Counter(i.severity for i in issues)
+    error_count = severity_counts["error"]
+    warning_count = severity_counts["warning"]
+    info_count = severity_counts["info"]
 
     lines.append(f"Found {len(issues)} issues: {error_count} errors, {warning_count} warnings, {info_count} info")
     lines.append("")
 
     for issue in issues:
-        prefix = {
-            "error": "ERROR",
-            "warning": "WARN",
-            "info": "INFO"
-        }.get(issue.severity, "???")
+        prefix = _SEVERITY_PREFIXES.get(issue.severity, "???")
 
         lines.append(f"[{prefix}] {issue.host}:{issue.interface} - {issue.message}")
 
     return "\n".join(lines)
 
 
+# Per-type accessors for interface fields, resolved on first use of a type
+_MAC_ACCESSORS: Dict[type, Callable[[Any], str]] = {}
+_STATE_ACCESSORS: Dict[type, Callable[[Any], str]] = {}
+
+
+def _resolve_accessor(iface_data, name: str) -> Callable[[Any], str]:
+    """Pick how to read field `name` from values of iface_data's type."""
+    if isinstance(iface_data, dict):
+        return lambda d: d.get(name, "unknown")
+    if hasattr(iface_data, name):
+        return attrgetter(name)
+    return lambda _: "unknown"
+
+
 def _get_mac(iface_data) -> str:
     """Extract MAC from interface data."""
-    if isinstance(iface_data, dict):
-        return iface_data.get("mac", "unknown")
-    if hasattr(iface_data, "mac"):
-        return getattr(iface_data, "mac", "unknown")
-    return "unknown"
+    accessor = _MAC_ACCESSORS.get(type(iface_data))
+    if accessor is None:
+        accessor = _MAC_ACCESSORS[type(iface_data)] = _resolve_accessor(iface_data, "mac")
+    return accessor(iface_data)
 
 
 def _get_state(iface_data) -> str:
     """Extract state from interface data."""
-    if isinstance(iface_data, dict):
-        return iface_data.get("state", "unknown")
-    if hasattr(iface_data, "state"):
-        return getattr(iface_data, "state", "unknown")
-    return "unknown"
+    accessor = _STATE_ACCESSORS.get(type(iface_data))
+    if accessor is None:
+        accessor = _STATE_ACCESSORS[type(iface_data)] = _resolve_accessor(iface_data, "state")
+    return accessor(iface_data)
 
 
 def to_ascii(
     topology: Topology,
     issues: Optional[List[ValidationIssue]] = None,
+    cache: bool = False
 ) -> str:
     """
     Generate ASCII art visualization of the network topology.
@@ -204,94 +414,106 @@ def to_ascii(
     Args:
         topology: Topology object to visualize
         issues: Optional list of validation issues
+        cache: Reuse the art from an earlier call with the same,
+            unchanged topology and issues (see _cached_render())
 
     Returns:
         ASCII art string representation
     """
-    lines = []
+    if cache:
+        return _cached_render("ascii", topology, issues, _render_ascii)
+    return _render_ascii(topology, issues)
+
+
+def _render_ascii(
+    topology: Topology,
+    issues: Optional[List[ValidationIssue]]
+) -> str:
+    """Render the to_ascii() diagram."""
+    buf = io.StringIO()
+    write = buf.write
 
     # Build connection lookup: (host, iface) -> (peer_host, peer_iface, bidirectional)
     connections: Dict[Tuple[str, str], Tuple[str, str, bool]] = {}
     for link in topology.links:
-        connections[(link.port_a.host, link.port_a.interface)] = (
-            link.port_b.host, link.port_b.interface, link.bidirectional
-        )
-        connections[(link.port_b.host, link.port_b.interface)] = (
-            link.port_a.host, link.port_a.interface, link.bidirectional
-        )
+        pa, pb, bidirectional = link.port_a, link.port_b, link.bidirectional
+        host_a, iface_a, host_b, iface_b = pa.host, pa.interface, pb.host, pb.interface
+        connections[(host_a, iface_a)] = (host_b, iface_b, bidirectional)
+        connections[(host_b, iface_b)] = (host_a, iface_a, bidirectional)
 
     # Title
-    lines.append("╔" + "═" * 62 + "╗")
-    lines.append("║" + "NETWORK TOPOLOGY".center(62) + "║")
-    lines.append("╚" + "═" * 62 + "╝")
-    lines.append("")
+    write(_TITLE_BOX)
+    write("\n")
 
     # Summary bar
-    summary = topology.to_dict()["summary"]
-    lines.append(f"  Hosts: {summary['host_count']}  │  "
-                 f"Links: {summary['link_count']}  │  "
-                 f"Bidirectional: {summary['bidirectional_links']}  │  "
-                 f"Unidirectional: {summary['unidirectional_links']}")
-    lines.append("")
+    summary = topology.summary()
+    write(f"  Hosts: {summary['host_count']}  │  "
+          f"Links: {summary['link_count']}  │  "
+          f"Bidirectional: {summary['bidirectional_links']}  │  "
+          f"Unidirectional: {summary['unidirectional_links']}\n")
+    write("\n")
+
+    # Host order shared by the host boxes and the connection matrix
+    host_ids = topology.sorted_host_ids()
 
     # Draw each host as a box
-    for host_id in sorted(topology.hosts.keys()):
+    for host_id in host_ids:
         host_info = topology.hosts[host_id]
-        lines.extend(_draw_host_box(host_id, host_info, connections))
-        lines.append("")
+        _draw_host_box(buf, host_id, host_info, connections)
+        write("\n")
 
     # Connection matrix
-    lines.append("┌" + "─" * 62 + "┐")
-    lines.append("│" + "CONNECTION MATRIX".center(62) + "│")
-    lines.append("└" + "─" * 62 + "┘")
-    lines.append("")
-    lines.extend(_draw_connection_matrix(topology))
-    lines.append("")
+    write(_MATRIX_BOX)
+    write("\n")
+    _draw_connection_matrix(buf, topology, host_ids)
+    write("\n")
 
     # Link diagram
-    lines.append("┌" + "─" * 62 + "┐")
-    lines.append("│" + "LINK DIAGRAM".center(62) + "│")
-    lines.append("└" + "─" * 62 + "┘")
-    lines.append("")
-    lines.extend(_draw_link_diagram(topology))
+    write(_LINK_DIAGRAM_BOX)
+    write("\n")
+    _draw_link_diagram(buf, topology)
 
     # Validation issues
     if issues:
-        lines.append("")
-        lines.append("┌" + "─" * 62 + "┐")
-        lines.append("│" + "VALIDATION ISSUES".center(62) + "│")
-        lines.append("└" + "─" * 62 + "┘")
+        write("\n")
+        write(_ISSUES_BOX)
         for issue in issues:
-            icon = {"error": "✗", "warning": "⚠", "info": "ℹ"}.get(issue.severity, "?")
-            lines.append(f"  {icon} [{issue.severity.upper()}] {issue.host}:{issue.interface}")
-            lines.append(f"      {issue.message}")
+            icon = _SEVERITY_ICONS.get(issue.severity, "?")
+            write(f"  {icon} [{issue.severity.upper()}] {issue.host}:{issue.interface}\n")
+            write(f"      {issue.message}\n")
 
-    return "\n".join(lines)
+    # Every line was written with a trailing newline; the report itself
+    # does not end with one
+    return buf.getvalue()[:-1]
 
 
 def _draw_host_box(
+    buf: TextIO,
     host_id: str,
     host_info,
     connections: Dict[Tuple[str, str], Tuple[str, str, bool]]
-) -> List[str]:
+) -> None:
     """Draw a single host as an ASCII box with interface connections."""
-    lines = []
+    write = buf.write
 
     # Determine box width
     hostname = host_info.hostname if hasattr(host_info, 'hostname') else host_id
     title = f" {host_id} ({hostname}) "
     box_width = max(58, len(title) + 4)
 
+    # Interface rows are truncated and left-aligned to the box width
+    row_template = f"│{{:<{box_width}.{box_width}}}│\n"
+
     # Top border
-    lines.append("┌" + "─" * box_width + "┐")
-    lines.append("│" + title.center(box_width) + "│")
-    lines.append("├" + "─" * box_width + "┤")
+    write("┌" + "─" * box_width + "┐\n")
+    write("│" + title.center(box_width) + "│\n")
+    write("├" + "─" * box_width + "┤\n")
 
     # Get interfaces
     interfaces = host_info.interfaces if hasattr(host_info, 'interfaces') else {}
 
     if not interfaces:
-        lines.append("│" + "(no interfaces)".center(box_width) + "│")
+        write("│" + "(no interfaces)".center(box_width) + "│\n")
     else:
         for iface_name in sorted(interfaces.keys()):
             iface_data = interfaces[iface_name]
@@ -322,91 +544,102 @@ def _draw_host_box(
                 padding = 1
 
             line_content = left_part + " " * padding + right_part
-            lines.append("│" + line_content[:box_width].ljust(box_width) + "│")
+            write(row_template.format(line_content))
 
     # Bottom border
-    lines.append("└" + "─" * box_width + "┘")
+    write("└" + "─" * box_width + "┘\n")
 
-    return lines
 
+def _draw_connection_matrix(
+    buf: TextIO,
+    topology: Topology,
+    hosts: Optional[Sequence[str]] = None
+) -> None:
+    """
+    Draw a matrix showing connections between hosts.
 
-def _draw_connection_matrix(topology: Topology) -> List[str]:
-    """Draw a matrix showing connections between hosts."""
-    lines = []
-    hosts = sorted(topology.hosts.keys())
+    Args:
+        buf: Buffer the matrix lines are written to
+        topology: Topology to draw
+        hosts: Host IDs in display order; topology's sorted order if omitted
+    """
+    write = buf.write
+    if hosts is None:
+        hosts = topology.sorted_host_ids()
 
     if not hosts:
-        lines.append("  (no hosts)")
-        return lines
+        write("  (no hosts)\n")
+        return
 
-    # Build adjacency data: host -> list of (local_iface, peer_host, peer_iface)
-    adjacency: Dict[str, Dict[str, List[Tuple[str, str]]]] = defaultdict(lambda: defaultdict(list))
+    # Build adjacency data: host -> peer_host -> list of (local_iface, peer_iface).
+    # Only connected host pairs get an entry.
+    neighbors_of: Dict[str, Dict[str, List[Tuple[str, str]]]] = {}
 
     for link in topology.links:
         h1, i1 = link.port_a.host, link.port_a.interface
         h2, i2 = link.port_b.host, link.port_b.interface
-        adjacency[h1][h2].append((i1, i2))
-        adjacency[h2][h1].append((i2, i1))
+        neighbors_of.setdefault(h1, {}).setdefault(h2, []).append((i1, i2))
+        neighbors_of.setdefault(h2, {}).setdefault(h1, []).append((i2, i1))
+    no_neighbors: Dict[str, List[Tuple[str, str]]] = {}
 
     # Header row
     col_width = 12
-    header = "  " + " " * col_width
+    write("  " + " " * col_width)
     for h in hosts:
-        header += h[:col_width].center(col_width)
-    lines.append(header)
-    lines.append("  " + "─" * (col_width + len(hosts) * col_width))
+        write(h[:col_width].center(col_width))
+    write("\n")
+    write("  " + "─" * (col_width + len(hosts) * col_width) + "\n")
 
     # Data rows
     for h1 in hosts:
-        row = f"  {h1[:col_width]:<{col_width}}"
+        write(f"  {h1[:col_width]:<{col_width}}")
+        # One lookup per row; cells probe the row's own peer dict
+        row_neighbors = neighbors_of.get(h1, no_neighbors)
         for h2 in hosts:
+            conns = row_neighbors.get(h2)
             if h1 == h2:
                 cell = "─"
-            elif h2 in adjacency[h1]:
-                conns = adjacency[h1][h2]
-                if len(conns) == 1:
-                    cell = f"{conns[0][0]}↔{conns[0][1]}"
-                else:
-                    cell = f"{len(conns)} links"
-            else:
+            elif conns is None:
                 cell = "·"
-            row += cell[:col_width].center(col_width)
-        lines.append(row)
-
-    return lines
+            elif len(conns) == 1:
+                cell = f"{conns[0][0]}↔{conns[0][1]}"
+            else:
+                cell = f"{len(conns)} links"
+            write(cell[:col_width].center(col_width))
+        write("\n")
 
 
-def _draw_link_diagram(topology: Topology) -> List[str]:
+def _draw_link_diagram(buf: TextIO, topology: Topology) -> None:
     """Draw a visual diagram of all links."""
-    lines = []
+    write = buf.write
 
     if not topology.links:
-        lines.append("  (no links discovered)")
-        return lines
+        write("  (no links discovered)\n")
+        return
 
-    # Group links by type
-    bidir_links = [l for l in topology.links if l.bidirectional]
-    unidir_links = [l for l in topology.links if not l.bidirectional]
+    # Group links by type in a single pass
+    bidir_links: List[Link] = []
+    unidir_links: List[Link] = []
+    for link in topology.links:
+        (bidir_links if link.bidirectional else unidir_links).append(link)
 
     if bidir_links:
-        lines.append("  Bidirectional Links (confirmed both directions):")
-        lines.append("  " + "─" * 50)
+        write("  Bidirectional Links (confirmed both directions):\n")
+        write(_SUBSECTION_RULE + "\n")
         for link in bidir_links:
             left = f"{link.port_a.host}:{link.port_a.interface}"
             right = f"{link.port_b.host}:{link.port_b.interface}"
             methods = ", ".join(link.discovery_methods)
-            lines.append(f"    {left:>25} ⟷ {right:<25}")
-            lines.append(f"    {'':>25}   └─ [{methods}]")
-        lines.append("")
+            write(f"    {left:>25} ⟷ {right:<25}\n")
+            write(f"    {'':>25}   └─ [{methods}]\n")
+        write("\n")
 
     if unidir_links:
-        lines.append("  Unidirectional Links (seen from one side only):")
-        lines.append("  " + "─" * 50)
+        write("  Unidirectional Links (seen from one side only):\n")
+        write(_SUBSECTION_RULE + "\n")
         for link in unidir_links:
             left = f"{link.port_a.host}:{link.port_a.interface}"
             right = f"{link.port_b.host}:{link.port_b.interface}"
             methods = ", ".join(link.discovery_methods)
-            lines.append(f"    {left:>25} → {right:<25}")
-            lines.append(f"    {'':>25}   └─ [{methods}]")
-
-    return lines
+            write(f"    {left:>25} → {right:<25}\n")
+            write(f"    {'':>25}   └─ [{methods}]\n")
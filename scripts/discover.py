@@ -12,8 +12,10 @@ Usage:
 import argparse
 import logging
 import os
+import re
 import sys
-from typing import Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, List, Union
 
 # Add parent directory to path for imports when running as script
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -21,6 +23,9 @@ project_root = os.path.dirname(script_dir)
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
+# Default cap on hosts collected concurrently
+DEFAULT_MAX_WORKERS = 32
+
 
 def setup_logging(verbose: bool = False) -> None:
     """Configure logging."""
@@ -36,7 +41,7 @@ def collect_host_data(
     ssh,
     host_id: str,
     hostname: str,
-    exclude_patterns: List[str],
+    exclude_patterns: Union[List[str], re.Pattern, None],
     use_probe: bool = False
 ) -> Dict[str, Any]:
     """
@@ -46,7 +51,8 @@ def collect_host_data(
         ssh: Connected SSH client
         host_id: Host identifier
         hostname: Host hostname/IP
-        exclude_patterns: Interface exclusion patterns
+        exclude_patterns: Interface exclusion patterns, or the compiled
+            regex from the inventory
         use_probe: Whether to use active probing
 
     Returns:
@@ -58,8 +64,8 @@ def collect_host_data(
 
     # Collect interface information
     logger.info("  Collecting interfaces...")
-    iface_collector = InterfaceCollector(ssh)
-    interfaces = iface_collector.collect(exclude_patterns=exclude_patterns)
+    iface_collector = InterfaceCollector(ssh, exclude_patterns=exclude_patterns)
+    interfaces = iface_collector.collect()
     logger.info(f"    Found {len(interfaces)} interfaces")
 
     # Get interface names for subsequent collectors
@@ -84,33 +90,90 @@ def collect_host_data(
     neighbor_count = sum(len(n) for n in neighbors.values())
     logger.info(f"    Found {neighbor_count} neighbor entries")
 
-    # Convert dataclasses to dicts for serialization
+    # Convert dataclasses to dicts for serialization. Link states and
+    # neighbors are both keyed by interface_names, so one pass covers all three
+    interfaces_out: Dict[str, Any] = {}
+    link_states_out: Dict[str, Any] = {}
+    neighbors_out: Dict[str, Any] = {}
+    for name in interface_names:
+        interfaces_out[name] = interfaces[name].to_dict()
+        state = link_states.get(name)
+        if state is not None:
+            link_states_out[name] = state.to_dict()
+        neighbor_list = neighbors.get(name)
+        if neighbor_list is not None:
+            neighbors_out[name] = [n.to_dict() for n in neighbor_list]
+
     return {
         "hostname": hostname,
-        "interfaces": {k: v.to_dict() for k, v in interfaces.items()},
-        "link_states": {k: v.to_dict() for k, v in link_states.items()},
-        "neighbors": {k: [n.to_dict() for n in v] for k, v in neighbors.items()},
+        "interfaces": interfaces_out,
+        "link_states": link_states_out,
+        "neighbors": neighbors_out,
     }
 
 
+def _collect_one(
+    host_id: str,
+    inventory: Dict[str, Any],
+    exclude_patterns: Union[List[str], re.Pattern, None],
+    use_probe: bool
+) -> Dict[str, Any]:
+    """
+    Connect to one host and collect its network data.
+
+    Args:
+        host_id: Host identifier
+        inventory: Processed inventory data
+        exclude_patterns: Interface exclusion patterns
+        use_probe: Whether to use active probing
+
+    Returns:
+        Dictionary containing all collected data
+
+    Raises:
+        SSHClientError: If the host cannot be reached
+    """
+    from ssh_client import SSHClient
+    from inventory import get_host_ssh_config
+
+    logging.getLogger(__name__).info(f"Connecting to {host_id}...")
+
+    ssh_config = get_host_ssh_config(inventory, host_id)
+    hostname = ssh_config.pop("hostname")
+
+    with SSHClient(hostname=hostname, **ssh_config) as ssh:
+        # Connect up front: the collectors log and skip failed commands, so
+        # an unreachable host would otherwise yield empty data, not an error
+        ssh.connect()
+        return collect_host_data(
+            ssh, host_id, hostname,
+            exclude_patterns, use_probe
+        )
+
+
 def discover_topology(
     inventory_path: str,
     use_probe: bool = False,
-    hosts_filter: List[str] = None
+    hosts_filter: List[str] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS
 ) -> tuple:
     """
     Discover network topology from all hosts in inventory.
 
+    Hosts are collected concurrently, since the time is spent waiting
+    on SSH round trips.
+
     Args:
         inventory_path: Path to hosts.yaml
         use_probe: Whether to use active probing
         hosts_filter: Optional list of specific hosts to scan
+        max_workers: Maximum number of hosts collected at once
 
     Returns:
         Tuple of (Topology, List[ValidationIssue], raw_data dict)
     """
-    from ssh_client import SSHClient, SSHClientError
-    from inventory import load_inventory, get_host_ssh_config, list_hosts
+    from ssh_client import SSHClientError
+    from inventory import load_inventory, list_hosts
     from engine import TopologyInferrer, TopologyValidator
 
     logger = logging.getLogger(__name__)
@@ -118,7 +181,7 @@ def discover_topology(
     # Load inventory
     logger.info(f"Loading inventory from {inventory_path}")
     inventory = load_inventory(inventory_path)
-    exclude_patterns = inventory.get("exclude_interfaces", [])
+    exclude_patterns = inventory.get("exclude_interfaces_re")
 
     # Get hosts to scan
     all_hosts = list_hosts(inventory)
@@ -132,29 +195,30 @@ def discover_topology(
     logger.info(f"Will scan {len(hosts_to_scan)} hosts: {', '.join(hosts_to_scan)}")
 
     # Collect data from all hosts
-    host_data: Dict[str, Dict[str, Any]] = {}
-    failed_hosts: List[str] = []
-
-    for host_id in hosts_to_scan:
-        logger.info(f"Connecting to {host_id}...")
-
-        try:
-            ssh_config = get_host_ssh_config(inventory, host_id)
-            hostname = ssh_config.pop("hostname")
-
-            with SSHClient(hostname=hostname, **ssh_config) as ssh:
-                data = collect_host_data(
-                    ssh, host_id, hostname,
-                    exclude_patterns, use_probe
-                )
-                host_data[host_id] = data
-
-        except SSHClientError as e:
-            logger.error(f"Failed to connect to {host_id}: {e}")
-            failed_hosts.append(host_id)
-        except Exception as e:
-            logger.error(f"Error collecting data from {host_id}: {e}")
-            failed_hosts.append(host_id)
+    collected: Dict[str, Dict[str, Any]] = {}
+    workers = max(1, min(max_workers, len(hosts_to_scan)))
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(
+                _collect_one, host_id, inventory, exclude_patterns, use_probe
+            ): host_id
+            for host_id in hosts_to_scan
+        }
+        for future in as_completed(futures):
+            host_id = futures[future]
+            try:
+                collected[host_id] = future.result()
+            except SSHClientError as e:
+                logger.error(f"Failed to connect to {host_id}: {e}")
+            except Exception as e:
+                logger.error(f"Error collecting data from {host_id}: {e}")
+
+    # Keep inventory order so inference output does not depend on timing
+    host_data: Dict[str, Dict[str, Any]] = {
+        host_id: collected[host_id] for host_id in hosts_to_scan if host_id in collected
+    }
+    failed_hosts: List[str] = [h for h in hosts_to_scan if h not in collected]
 
     if failed_hosts:
         logger.warning(f"Failed to collect from {len(failed_hosts)} hosts: {', '.join(failed_hosts)}")
@@ -205,6 +269,12 @@ def main():
         action="store_true",
         help="Enable active probing for neighbor discovery"
     )
+    parser.add_argument(
+        "-j", "--workers",
+        type=int,
+        default=DEFAULT_MAX_WORKERS,
+        help=f"Maximum number of hosts to collect from at once (default: {DEFAULT_MAX_WORKERS})"
+    )
     parser.add_argument(
         "-v", "--verbose",
         action="store_true",
@@ -226,7 +296,8 @@ def main():
         topology, issues, raw_data = discover_topology(
             args.inventory,
             use_probe=args.probe,
-            hosts_filter=args.hosts
+            hosts_filter=args.hosts,
+            max_workers=args.workers
         )
 
         # Output results
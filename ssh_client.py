@@ -5,20 +5,372 @@ Provides SSH connectivity to remote hosts for network data collection.
 Implements the interface expected by all collector modules.
 """
 
+from __future__ import annotations
+
 import os
+import codecs
+import functools
+import hashlib
+import inspect
 import logging
-from typing import Optional
-
-import paramiko
+import re
+import select
+import socket
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from ssh_pool import default_pool
+
+if TYPE_CHECKING:
+    # Imported where used: paramiko loads the whole crypto stack, which
+    # runs that never open a connection should not pay for
+    import paramiko
 
 logger = logging.getLogger(__name__)
 
+# sshd's default MaxSessions: concurrent channels allowed per connection
+DEFAULT_MAX_SESSIONS = 10
+
+# sshd's default MaxStartups: concurrent unauthenticated connections
+DEFAULT_MAX_STARTUPS = 10
+
+# Seconds between transport keepalive packets
+KEEPALIVE_INTERVAL = 30
+
+# Preferred algorithms: AEAD ciphers and encrypt-then-MAC modes use the
+# AES-NI/CLMUL paths of the crypto backend, curve25519 is the fastest KEX.
+# Names the installed paramiko does not implement are skipped, and its other
+# defaults stay negotiable after these.
+DEFAULT_CIPHERS = (
+    "aes128-gcm@openssh.com",
+    "aes256-gcm@openssh.com",
+    "chacha20-poly1305@openssh.com",
+)
+DEFAULT_MACS = ("hmac-sha2-256-etm@openssh.com", "hmac-sha2-512-etm@openssh.com")
+DEFAULT_KEX = ("curve25519-sha256", "curve25519-sha256@libssh.org")
+
+
+# Delays before successive reconnect attempts after a dropped connection
+RETRY_BACKOFF = (0.1, 0.5)
+
+# Handshakes in flight per host; sshd drops connections beyond MaxStartups
+# (default 10) while they are still unauthenticated
+MAX_HANDSHAKES_PER_HOST = 8
+
+# hostname -> semaphore bounding that host's concurrent handshakes
+_handshake_slots: Dict[str, threading.BoundedSemaphore] = {}
+
+# Bytes requested per channel read
+READ_CHUNK_SIZE = 65536
+
+# Command result cache: LRU bound and default TTL (seconds) for execute_cached()
+RESULT_CACHE_SIZE = 1024
+DEFAULT_RESULT_CACHE_TTL = 5.0
+
+# Prompt at the end of an interactive shell's login banner, e.g.
+# "\r\nrouter# "; the matched line is then waited for literally
+DEFAULT_PROMPT_PATTERN = r"[\r\n][^\r\n]*[#>$] ?$"
+
+# Bytes read per recv() from an interactive shell, and how far back from
+# the end of the banner the prompt pattern is searched for
+SHELL_READ_SIZE = 4096
+PROMPT_SEARCH_WINDOW = 512
+
+# Read-only device commands that execute_cached() may serve from the cache
+CACHEABLE_PREFIXES = ("show ", "display ", "get ")
+
+# Private key types tried in order; DSSKey is gone from paramiko >= 4
+_PKEY_CLASS_NAMES = ("Ed25519Key", "ECDSAKey", "RSAKey", "DSSKey")
+
+# (path, st_mtime_ns) -> parsed key, shared by all clients in the process
+_pkey_cache: Dict[Tuple[str, int], paramiko.PKey] = {}
+_pkey_cache_lock = threading.Lock()
+
+# (hostname, port, username, cmd) -> (expiry on the monotonic clock, output)
+_result_cache: "OrderedDict[Tuple[str, int, str, str], Tuple[float, str]]" = OrderedDict()
+_result_cache_lock = threading.RLock()
+
+
+@functools.lru_cache(maxsize=None)
+def _has_transport_factory() -> bool:
+    """SSHClient.connect(transport_factory=...) exists from paramiko 3.2."""
+    import paramiko
+    return "transport_factory" in inspect.signature(paramiko.SSHClient.connect).parameters
+
+
+def _prefer(
+    preferred: Sequence[str],
+    supported: Sequence[str],
+    defaults: Sequence[str]
+) -> Tuple[str, ...]:
+    """Supported names from preferred, followed by the remaining defaults."""
+    head = tuple(name for name in preferred if name in supported)
+    return head + tuple(name for name in defaults if name not in head)
+
+
+def _handshake_slot(hostname: str) -> threading.BoundedSemaphore:
+    slot = _handshake_slots.get(hostname)
+    if slot is None:
+        # setdefault keeps one semaphore per host if threads race here
+        slot = _handshake_slots.setdefault(
+            hostname, threading.BoundedSemaphore(MAX_HANDSHAKES_PER_HOST)
+        )
+    return slot
+
+
+@functools.lru_cache(maxsize=256)
+def _expand_key_path(key_file: str) -> str:
+    """Expand ~ in a configured key path; the result only depends on key_file."""
+    return os.path.expanduser(key_file)
+
+
+def _load_private_key(path: str) -> Optional[paramiko.PKey]:
+    """
+    Parse a private key file once per modification time.
+
+    Returns None if no key type can read the file (e.g. it needs a
+    passphrase), in which case paramiko is left to load it by path.
+    """
+    import paramiko
+
+    try:
+        cache_key = (path, os.stat(path).st_mtime_ns)
+    except OSError:
+        return None
+
+    with _pkey_cache_lock:
+        pkey = _pkey_cache.get(cache_key)
+    if pkey is not None:
+        return pkey
+
+    for name in _PKEY_CLASS_NAMES:
+        key_class = getattr(paramiko, name, None)
+        if key_class is None:
+            continue
+        try:
+            pkey = key_class.from_private_key_file(path)
+            break
+        except (paramiko.SSHException, ValueError):
+            continue
+    else:
+        return None
+
+    with _pkey_cache_lock:
+        _pkey_cache[cache_key] = pkey
+    return pkey
+
+
+def _cache_get(key: Tuple[str, int, str, str]) -> Optional[str]:
+    with _result_cache_lock:
+        entry = _result_cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del _result_cache[key]
+            return None
+        _result_cache.move_to_end(key)
+        return entry[1]
+
+
+def _cache_put(key: Tuple[str, int, str, str], output: str, ttl: float) -> None:
+    with _result_cache_lock:
+        _result_cache[key] = (time.monotonic() + ttl, output)
+        _result_cache.move_to_end(key)
+        if len(_result_cache) > RESULT_CACHE_SIZE:
+            _result_cache.popitem(last=False)
+
+
+def _cache_invalidate_host(hostname: str, port: int, username: str) -> None:
+    with _result_cache_lock:
+        for key in [k for k in _result_cache if k[:3] == (hostname, port, username)]:
+            del _result_cache[key]
+
 
 class SSHClientError(Exception):
     """Exception raised for SSH client errors."""
     pass
 
 
+class _DeadlineExceeded(socket.timeout):
+    """A command ran past the deadline given to execute()."""
+
+
+def _read_channel(
+    chan: paramiko.Channel,
+    timeout: float,
+    err: bytearray,
+    expires: Optional[float] = None
+) -> Iterator[bytes]:
+    """
+    Yield a command's stdout chunks as they arrive, until EOF.
+
+    Stderr is read in the same loop and appended to err, so a command that
+    fills the stderr window while stdout is still open cannot stall.
+
+    Raises:
+        socket.timeout: If the channel is silent for timeout seconds, or
+            time.monotonic() passes expires
+    """
+    wait = timeout
+    while True:
+        if expires is not None:
+            wait = min(timeout, expires - time.monotonic())
+            if wait <= 0:
+                raise _DeadlineExceeded()
+        # Checked before the buffers: data can still follow exit-status (sshd
+        # sends it when the child exits, not when its pipes are drained),
+        # but nothing follows EOF, so empty buffers after EOF mean done
+        eof = chan.eof_received or chan.closed
+        if chan.recv_ready():
+            yield chan.recv(READ_CHUNK_SIZE)
+            continue
+        if chan.recv_stderr_ready():
+            err += chan.recv_stderr(READ_CHUNK_SIZE)
+            continue
+        if eof:
+            break
+        # The channel's fileno becomes readable on stdout, stderr, EOF or close
+        readable, _, _ = select.select([chan], [], [], wait)
+        if not readable:
+            if wait < timeout:
+                raise _DeadlineExceeded()
+            raise socket.timeout(f"No output for {timeout} s")
+
+
+def _decode(data: bytes) -> str:
+    """
+    Decode command output as UTF-8, replacing invalid bytes.
+
+    Valid output, the common case, is decoded strictly; the replacing
+    decoder only runs when there are invalid bytes.
+    """
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        return data.decode("utf-8", errors="replace")
+
+
+def _drain_channel(
+    chan: paramiko.Channel,
+    timeout: float,
+    expires: Optional[float] = None
+) -> Tuple[bytes, bytes]:
+    """Read a command's complete stdout and stderr."""
+    err = bytearray()
+    out = b"".join(_read_channel(chan, timeout, err, expires))
+    return out, bytes(err)
+
+
+class ShellSession:
+    """
+    Interactive shell channel for devices without an exec subsystem.
+
+    Network devices such as Cisco IOS or Huawei VRP often refuse exec
+    requests. A ShellSession keeps one invoke_shell() channel open, writes
+    each command to it and reads until the prompt comes back. Commands on
+    one session are serialized.
+
+    The prompt pattern is only matched against the login banner, whose
+    last line is taken as the device's prompt. Command output is read
+    until it ends in that exact line, since "#" separator lines or XML
+    output would also match the pattern.
+    """
+
+    def __init__(
+        self,
+        client: paramiko.SSHClient,
+        timeout: float,
+        prompt_pattern: str = DEFAULT_PROMPT_PATTERN
+    ):
+        """
+        Open the shell, wait for the first prompt and learn it.
+
+        Args:
+            client: Connected paramiko client
+            timeout: Seconds to wait for output before giving up
+            prompt_pattern: Regex matching the prompt at the end of the
+                login banner
+        """
+        self._prompt_re = re.compile(prompt_pattern.encode())
+        self._prompt: Optional[bytes] = None
+        self._timeout = timeout
+        self._lock = threading.Lock()
+        self._chan = client.invoke_shell(width=512, height=1000)
+        self._chan.settimeout(timeout)
+        banner = self._read_until_prompt()
+        self._prompt = re.split(rb"[\r\n]", banner)[-1]
+
+    def execute(self, cmd: str, expires: Optional[float] = None) -> str:
+        """Run a command and return its decoded output."""
+        return _decode(self.execute_bytes(cmd, expires))
+
+    def execute_bytes(self, cmd: str, expires: Optional[float] = None) -> bytes:
+        """
+        Run a command and return its raw output.
+
+        The echoed command line and the trailing prompt are removed, and
+        line endings are normalized to "\n".
+
+        Raises:
+            socket.timeout: If no prompt arrives within the timeout, or
+                time.monotonic() passes expires
+        """
+        with self._lock:
+            self._chan.sendall(cmd.encode() + b"\n")
+            raw = self._read_until_prompt(expires)
+
+        # Keep the newline before the prompt so output ends like exec output
+        data = raw[:len(raw) - len(self._prompt)]
+
+        first_line, sep, rest = data.partition(b"\n")
+        if sep and first_line.rstrip(b"\r") == cmd.strip().encode():
+            data = rest
+        return data.replace(b"\r\n", b"\n")
+
+    def _read_until_prompt(self, expires: Optional[float] = None) -> bytes:
+        import paramiko
+
+        buf = bytearray()
+        try:
+            while True:
+                if expires is not None:
+                    remaining = expires - time.monotonic()
+                    if remaining <= 0:
+                        raise _DeadlineExceeded()
+                    self._chan.settimeout(min(self._timeout, remaining))
+                try:
+                    data = self._chan.recv(SHELL_READ_SIZE)
+                except socket.timeout:
+                    if expires is not None and time.monotonic() >= expires:
+                        raise _DeadlineExceeded()
+                    raise
+                if not data:
+                    raise paramiko.SSHException("Shell closed before prompt")
+                buf += data
+                if self._at_prompt(buf):
+                    return bytes(buf)
+        finally:
+            if expires is not None:
+                self._chan.settimeout(self._timeout)
+
+    def _at_prompt(self, buf: bytearray) -> bool:
+        """Whether buf ends with the prompt on a line of its own."""
+        if self._prompt is None:
+            # Only the tail can hold the prompt; avoids rescanning long output
+            start = max(0, len(buf) - PROMPT_SEARCH_WINDOW)
+            return self._prompt_re.search(buf, start) is not None
+        before = len(buf) - len(self._prompt) - 1
+        return buf.endswith(self._prompt) and before >= 0 and buf[before] in b"\r\n"
+
+    def close(self) -> None:
+        """Close the shell channel."""
+        self._chan.close()
+
+
 class SSHClient:
     """
     SSH client for executing commands on remote hosts.
@@ -27,6 +379,14 @@ class SSHClient:
     - execute(cmd: str) -> str
 
     Supports both key-based and password authentication.
+
+    A single instance may be shared between threads: commands run on
+    separate channels of the same transport, at most max_sessions at a
+    time, and the lazy connect in execute() is serialized.
+
+    With pooled=True (the default), close() hands the authenticated
+    connection to ssh_pool.default_pool instead of closing it, and the
+    next client with the same host and credentials picks it up again.
     """
 
     def __init__(
@@ -37,7 +397,15 @@ class SSHClient:
         auth_type: str = "key",
         key_file: Optional[str] = None,
         password: Optional[str] = None,
-        timeout: int = 10
+        timeout: int = 10,
+        pooled: bool = True,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+        shell: bool = False,
+        prompt_pattern: str = DEFAULT_PROMPT_PATTERN,
+        max_retries: int = 1,
+        ciphers: Sequence[str] = DEFAULT_CIPHERS,
+        macs: Sequence[str] = DEFAULT_MACS,
+        kex: Sequence[str] = DEFAULT_KEX
     ):
         """
         Initialize SSH client.
@@ -50,6 +418,18 @@ class SSHClient:
             key_file: Path to private key file (for key auth)
             password: Password (for password auth)
             timeout: Connection timeout in seconds
+            pooled: Reuse connections through the process-wide pool
+            max_sessions: Concurrent command channels on the connection;
+                keep at or below the server's MaxSessions
+            shell: Run commands through an interactive ShellSession instead
+                of exec channels, for devices without an exec subsystem
+            prompt_pattern: Regex finding the prompt after the login
+                banner in shell mode
+            max_retries: Reconnect-and-retry attempts when a command fails
+                because the connection was dropped
+            ciphers: Ciphers to prefer, in order
+            macs: MACs to prefer, in order
+            kex: Key exchange algorithms to prefer, in order
         """
         self.hostname = hostname
         self.port = port
@@ -58,9 +438,20 @@ class SSHClient:
         self.key_file = key_file
         self.password = password
         self.timeout = timeout
+        self.pooled = pooled
+        self.shell = shell
+        self.prompt_pattern = prompt_pattern
+        self.max_retries = max_retries
+        self.ciphers = tuple(ciphers)
+        self.macs = tuple(macs)
+        self.kex = tuple(kex)
 
         self._client: Optional[paramiko.SSHClient] = None
+        self._transport: Optional[paramiko.Transport] = None
+        self._shell: Optional[ShellSession] = None
+        self._sessions = threading.BoundedSemaphore(max_sessions)
         self._connected = False
+        self._connect_lock = threading.Lock()
 
     def connect(self) -> None:
         """
@@ -72,8 +463,48 @@ class SSHClient:
         if self._connected:
             return
 
-        self._client = paramiko.SSHClient()
-        self._client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        import paramiko
+
+        if self.pooled:
+            self._client = default_pool.checkout(self._pool_key(), self._open_client)
+        else:
+            self._client = self._open_client()
+        self._transport = self._client.get_transport()
+        self._transport.set_keepalive(KEEPALIVE_INTERVAL)
+
+        if self.shell:
+            try:
+                self._shell = ShellSession(self._client, self.timeout, self.prompt_pattern)
+            except (paramiko.SSHException, OSError) as e:
+                self._client.close()
+                self._client = None
+                raise SSHClientError(f"Failed to open shell on {self.hostname}: {e}")
+
+        self._connected = True
+
+    def _pool_key(self) -> tuple:
+        """Connection pool key: endpoint plus credentials."""
+        # A different password must not pick up a connection authenticated
+        # with another one; only a digest is kept in the key
+        password_digest = (
+            hashlib.sha256(self.password.encode()).hexdigest() if self.password else None
+        )
+        return (
+            self.hostname, self.port, self.username,
+            self.auth_type, self.key_file, password_digest,
+        )
+
+    def _open_client(self) -> paramiko.SSHClient:
+        """
+        Open and authenticate a new paramiko client.
+
+        Raises:
+            SSHClientError: If connection fails
+        """
+        import paramiko
+
+        client = paramiko.SSHClient()
+        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
 
         try:
             connect_kwargs = {
@@ -84,11 +515,18 @@ class SSHClient:
                 "allow_agent": False,
                 "look_for_keys": False,
             }
+            if _has_transport_factory():
+                connect_kwargs["transport_factory"] = self._make_transport
 
             if self.auth_type == "key":
                 key_path = self._resolve_key_path()
                 if key_path:
-                    connect_kwargs["key_filename"] = key_path
+                    # Reuse the parsed key instead of re-reading it per connect
+                    pkey = _load_private_key(key_path)
+                    if pkey is not None:
+                        connect_kwargs["pkey"] = pkey
+                    else:
+                        connect_kwargs["key_filename"] = key_path
                 else:
                     # Fall back to allowing agent/keys lookup
                     connect_kwargs["allow_agent"] = True
@@ -101,9 +539,26 @@ class SSHClient:
                 raise SSHClientError(f"Unknown auth_type: {self.auth_type}")
 
             logger.debug(f"Connecting to {self.hostname}:{self.port} as {self.username}")
-            self._client.connect(**connect_kwargs)
-            self._connected = True
+            attempt = 0
+            while True:
+                try:
+                    # Held until authentication completes; established
+                    # connections do not count against MaxStartups
+                    with _handshake_slot(self.hostname):
+                        client.connect(**connect_kwargs)
+                    break
+                except paramiko.AuthenticationException:
+                    raise
+                except paramiko.SSHException as e:
+                    # Banner or key exchange cut off, typically by MaxStartups
+                    if attempt >= self.max_retries:
+                        raise
+                    delay = RETRY_BACKOFF[min(attempt, len(RETRY_BACKOFF) - 1)]
+                    attempt += 1
+                    logger.info(f"Handshake with {self.hostname} failed ({e}), retrying")
+                    time.sleep(delay)
             logger.info(f"Connected to {self.hostname}")
+            return client
 
         except paramiko.AuthenticationException as e:
             raise SSHClientError(f"Authentication failed for {self.hostname}: {e}")
@@ -112,62 +567,349 @@ class SSHClient:
         except OSError as e:
             raise SSHClientError(f"Network error connecting to {self.hostname}: {e}")
 
+    def _make_transport(self, sock: Any, **kwargs: Any) -> paramiko.Transport:
+        """Create the transport with this client's algorithm preferences."""
+        import paramiko
+
+        transport = paramiko.Transport(sock, **kwargs)
+        # Instance attributes shadow paramiko's class-level defaults
+        transport._preferred_ciphers = _prefer(
+            self.ciphers, paramiko.Transport._cipher_info, paramiko.Transport._preferred_ciphers
+        )
+        transport._preferred_macs = _prefer(
+            self.macs, paramiko.Transport._mac_info, paramiko.Transport._preferred_macs
+        )
+        transport._preferred_kex = _prefer(
+            self.kex, paramiko.Transport._kex_info, paramiko.Transport._preferred_kex
+        )
+        return transport
+
     def _resolve_key_path(self) -> Optional[str]:
         """Resolve the SSH key file path, expanding ~ and checking existence."""
         if not self.key_file:
             return None
 
-        path = os.path.expanduser(self.key_file)
+        path = _expand_key_path(self.key_file)
+        # Existence is still checked per call so a key added or removed
+        # later is noticed
         if os.path.isfile(path):
             return path
 
         logger.warning(f"Key file not found: {path}")
         return None
 
-    def execute(self, cmd: str) -> str:
+    def execute(
+        self,
+        cmd: str,
+        *,
+        cache_ttl: Optional[float] = None,
+        deadline: Optional[float] = None
+    ) -> str:
         """
         Execute a command on the remote host.
 
         Args:
             cmd: Command to execute
+            cache_ttl: If set, reuse an output of the same command run as
+                the same user on this host that is at most this many
+                seconds old, and cache the new output otherwise. Only for
+                read-only commands.
+            deadline: If set, fail once the command has run this many
+                seconds in total, even if it is still producing output.
+                Without it only silence longer than timeout fails.
 
         Returns:
             Command output (stdout)
 
         Raises:
-            SSHClientError: If not connected or command execution fails
+            SSHClientError: If not connected, command execution fails or
+                the command times out
         """
-        if not self._connected or not self._client:
-            self.connect()
+        if not cache_ttl:
+            return _decode(self._run(cmd, deadline))
 
-        try:
-            logger.debug(f"Executing on {self.hostname}: {cmd}")
-            stdin, stdout, stderr = self._client.exec_command(cmd, timeout=self.timeout)
+        key = (self.hostname, self.port, self.username, cmd)
+        output = _cache_get(key)
+        if output is None:
+            output = _decode(self._run(cmd, deadline))
+            _cache_put(key, output, cache_ttl)
+        return output
 
-            output = stdout.read().decode("utf-8", errors="replace")
-            error = stderr.read().decode("utf-8", errors="replace")
+    def execute_bytes(self, cmd: str, *, deadline: Optional[float] = None) -> bytes:
+        """
+        Execute a command and return its stdout undecoded.
 
-            exit_status = stdout.channel.recv_exit_status()
+        For outputs that are stored or passed on as bytes, this skips the
+        UTF-8 decode pass. Not cached; deadline is as for execute().
 
-            if exit_status != 0 and error:
-                logger.debug(f"Command returned {exit_status}: {error.strip()}")
+        Raises:
+            SSHClientError: If not connected, command execution fails or
+                the command times out
+        """
+        return self._run(cmd, deadline)
 
-            return output
+    def execute_cached(self, cmd: str, ttl: float = DEFAULT_RESULT_CACHE_TTL) -> str:
+        """
+        Execute a command, caching the output if it is a read-only query.
 
-        except paramiko.SSHException as e:
+        Commands starting with one of CACHEABLE_PREFIXES are cached for
+        ttl seconds; anything else always runs.
+        """
+        if cmd.startswith(CACHEABLE_PREFIXES):
+            return self.execute(cmd, cache_ttl=ttl)
+        return self.execute(cmd)
+
+    def execute_many(self, cmds: List[str]) -> List[str]:
+        """
+        Execute several commands in one shell script on one channel.
+
+        Commands run sequentially and must be independent: a command that
+        exits the shell (e.g. `exit`) ends the script, and the remaining
+        outputs come back empty. Non-zero exit codes are logged.
+
+        Args:
+            cmds: Commands to execute
+
+        Returns:
+            Stdout of each command, in the order of cmds
+        """
+        if not cmds:
+            return []
+        if self.shell:
+            # A shell script would print a prompt per line; send one at a time
+            return [self.execute(cmd) for cmd in cmds]
+
+        # Unique per call so command output cannot fake a separator. The
+        # leading newline is removed again when splitting, so outputs keep
+        # their own trailing newline (or lack of one).
+        delim = f"---NC{uuid.uuid4().hex}---"
+        script = "".join(f"{cmd}\nprintf '\\n%s%s\\n' '{delim}' \"$?\"\n" for cmd in cmds)
+        chunks = _decode(self._run(script)).split("\n" + delim)
+
+        outputs = []
+        text = chunks[0]
+        for cmd, chunk in zip(cmds, chunks[1:]):
+            outputs.append(text)
+            exit_status, _, text = chunk.partition("\n")
+            if exit_status != "0":
+                logger.debug(f"Command returned {exit_status}: {cmd}")
+
+        # Output cut short: missing commands count as empty output
+        outputs.extend("" for _ in range(len(cmds) - len(outputs)))
+        return outputs
+
+    @classmethod
+    def run_on_hosts(
+        cls,
+        host_configs: List[Dict[str, Any]],
+        cmd: str,
+        max_workers: int = 32,
+        max_startups: int = DEFAULT_MAX_STARTUPS
+    ) -> Dict[str, str]:
+        """
+        Execute one command on many hosts in parallel.
+
+        Args:
+            host_configs: SSHClient keyword arguments per host, each with
+                at least "hostname"
+            cmd: Command to execute
+            max_workers: Hosts handled concurrently
+            max_startups: Connection handshakes in flight at once
+
+        Returns:
+            Hostname to command output. Hosts that fail are logged and left out.
+        """
+        if not host_configs:
+            return {}
+
+        startups = threading.Semaphore(max_startups)
+
+        def run_one(config: Dict[str, Any]) -> str:
+            ssh = cls(**config)
+            try:
+                with startups:
+                    ssh.connect()
+                return ssh.execute(cmd)
+            finally:
+                ssh.close()
+
+        results: Dict[str, str] = {}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(host_configs))) as executor:
+            futures = {
+                executor.submit(run_one, config): config["hostname"]
+                for config in host_configs
+            }
+            for future in as_completed(futures):
+                hostname = futures[future]
+                try:
+                    results[hostname] = future.result()
+                except (SSHClientError, OSError) as e:
+                    logger.warning(f"{hostname}: {e}")
+        return results
+
+    def _run(self, cmd: str, deadline: Optional[float] = None) -> bytes:
+        """
+        Run a command and return its raw stdout.
+
+        If the command fails because the transport has died (e.g. an idle
+        connection dropped by a firewall), the connection is re-established
+        and the command retried, up to max_retries times. Retries count
+        against the same deadline.
+        """
+        import paramiko
+
+        expires = time.monotonic() + deadline if deadline is not None else None
+        attempt = 0
+        while True:
+            self._ensure_connected()
+            transport = self._transport
+            try:
+                return self._run_once(cmd, expires)
+            except _DeadlineExceeded:
+                raise SSHClientError(
+                    f"Command on {self.hostname} timed out after {deadline} s: {cmd}"
+                )
+            except socket.timeout as e:
+                raise SSHClientError(f"Command on {self.hostname} timed out: {e}")
+            except (paramiko.SSHException, EOFError, OSError) as e:
+                if attempt >= self.max_retries or transport.is_active():
+                    raise SSHClientError(f"Failed to execute command on {self.hostname}: {e}")
+                delay = RETRY_BACKOFF[min(attempt, len(RETRY_BACKOFF) - 1)]
+                attempt += 1
+                logger.info(f"Connection to {self.hostname} lost ({e}), reconnecting")
+                self._drop_connection(transport)
+                time.sleep(delay)
+
+    def _ensure_connected(self) -> None:
+        if not self._connected or not self._client:
+            with self._connect_lock:
+                if not self._connected or not self._client:
+                    self.connect()
+
+    def _drop_connection(self, transport: paramiko.Transport) -> None:
+        """Discard a dead connection so the next command reconnects."""
+        with self._connect_lock:
+            if self._transport is not transport:
+                # Another thread already reconnected
+                return
+            if self._shell is not None:
+                self._shell.close()
+                self._shell = None
+            # Closed rather than released: the pool only keeps live clients
+            self._client.close()
+            self._client = None
+            self._transport = None
+            self._connected = False
+
+    def _run_once(self, cmd: str, expires: Optional[float] = None) -> bytes:
+        """Run a command on the current connection."""
+        logger.debug(f"Executing on {self.hostname}: {cmd}")
+        if self._shell is not None:
+            return self._shell.execute_bytes(cmd, expires)
+
+        with self._sessions:
+            chan = self._open_channel(cmd)
+            try:
+                out, err = _drain_channel(chan, self.timeout, expires)
+                exit_status = chan.recv_exit_status()
+            finally:
+                chan.close()
+
+        if exit_status != 0 and err:
+            error = _decode(err)
+            logger.debug(f"Command returned {exit_status}: {error.strip()}")
+
+        return out
+
+    def _open_channel(self, cmd: str) -> paramiko.Channel:
+        """Start a command on a new channel of the shared transport."""
+        chan = self._transport.open_session(timeout=self.timeout)
+        try:
+            chan.settimeout(self.timeout)
+            chan.exec_command(cmd)
+            # Nothing is sent on stdin; EOF now lets the remote side
+            # finish without waiting on it
+            chan.shutdown_write()
+        except BaseException:
+            chan.close()
+            raise
+        return chan
+
+    def execute_stream(self, cmd: str) -> Iterator[str]:
+        """
+        Execute a command and yield its stdout as it arrives.
+
+        Lets callers start parsing large outputs before the command ends,
+        without holding the whole output in memory. Multi-byte characters
+        split between reads are decoded whole. Unlike execute(), output is
+        neither cached nor retried. The channel stays open until the
+        generator is exhausted or closed.
+
+        Raises:
+            SSHClientError: If command execution fails
+        """
+        import paramiko
+
+        self._ensure_connected()
+        logger.debug(f"Streaming on {self.hostname}: {cmd}")
+        if self._shell is not None:
+            # The prompt only shows where the output ends once it has arrived
+            yield self._shell.execute(cmd)
+            return
+
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        err = bytearray()
+        try:
+            with self._sessions:
+                chan = self._open_channel(cmd)
+                try:
+                    for chunk in _read_channel(chan, self.timeout, err):
+                        text = decoder.decode(chunk)
+                        if text:
+                            yield text
+                    text = decoder.decode(b"", final=True)
+                    if text:
+                        yield text
+                    exit_status = chan.recv_exit_status()
+                finally:
+                    chan.close()
+        except socket.timeout as e:
+            raise SSHClientError(f"Command on {self.hostname} timed out: {e}")
+        except (paramiko.SSHException, EOFError) as e:
             raise SSHClientError(f"Failed to execute command on {self.hostname}: {e}")
 
+        if exit_status != 0 and err:
+            logger.debug(
+                f"Command returned {exit_status}: "
+                f"{_decode(err).strip()}"
+            )
+
     def close(self) -> None:
-        """Close the SSH connection."""
-        if self._client:
+        """Close the SSH connection, or return it to the pool if pooled."""
+        _cache_invalidate_host(self.hostname, self.port, self.username)
+        if self._shell is not None:
+            self._shell.close()
+            self._shell = None
+        if not self._client:
+            # Never connected, or already closed
+            return
+        if self.pooled:
+            default_pool.release(self._pool_key(), self._client)
+        else:
             self._client.close()
-            self._client = None
+        self._client = None
+        self._transport = None
         self._connected = False
         logger.debug(f"Disconnected from {self.hostname}")
 
     def __enter__(self) -> "SSHClient":
-        """Context manager entry - connect to host."""
-        self.connect()
+        """
+        Context manager entry.
+
+        Does not connect: the connection is made by the first command, so
+        a block that runs none costs no handshake. Call connect() to fail
+        early on an unreachable host.
+        """
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:
@@ -0,0 +1,115 @@
+"""
+SSH Connection Pool
+
+Keeps authenticated paramiko clients open after an SSHClient is closed so
+that the next SSHClient for the same host and credentials skips the TCP
+handshake, key exchange and authentication.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Callable, Deque, Dict, Hashable, Iterator
+
+if TYPE_CHECKING:
+    import paramiko
+
+logger = logging.getLogger(__name__)
+
+# Idle connections kept per key; stays below sshd's default MaxStartups (10)
+DEFAULT_MAX_IDLE_PER_KEY = 8
+
+
+class SSHConnectionPool:
+    """
+    Process-wide store of idle, authenticated paramiko clients.
+
+    Clients are grouped by a connection key such as
+    (hostname, port, username, auth_type, key_file). A checked-out client
+    belongs to the caller until it is released; idle clients are checked
+    with transport.is_active() before being handed out again.
+    """
+
+    def __init__(self, max_idle_per_key: int = DEFAULT_MAX_IDLE_PER_KEY):
+        """
+        Initialize the pool.
+
+        Args:
+            max_idle_per_key: Idle clients kept per key; extra released
+                clients are closed
+        """
+        self.max_idle_per_key = max_idle_per_key
+        self._idle: Dict[Hashable, Deque[paramiko.SSHClient]] = {}
+        self._lock = threading.Lock()
+
+    def checkout(
+        self,
+        key: Hashable,
+        factory: Callable[[], paramiko.SSHClient]
+    ) -> paramiko.SSHClient:
+        """
+        Take a live idle client for key, or create one with factory().
+
+        Exceptions raised by factory() propagate to the caller.
+        """
+        while True:
+            with self._lock:
+                idle = self._idle.get(key)
+                client = idle.pop() if idle else None
+
+            if client is None:
+                return factory()
+            if _is_alive(client):
+                logger.debug("Reusing pooled SSH connection")
+                return client
+            client.close()
+
+    def release(self, key: Hashable, client: paramiko.SSHClient) -> None:
+        """Return a client to the pool, closing it if dead or over the cap."""
+        if _is_alive(client):
+            with self._lock:
+                idle = self._idle.setdefault(key, deque())
+                if len(idle) < self.max_idle_per_key:
+                    idle.append(client)
+                    return
+        client.close()
+
+    @contextmanager
+    def acquire(
+        self,
+        key: Hashable,
+        factory: Callable[[], paramiko.SSHClient]
+    ) -> Iterator[paramiko.SSHClient]:
+        """
+        Check out a client for the duration of a with-block.
+
+        The client is released on normal exit and closed if the block
+        raises, since its transport may be in an unknown state.
+        """
+        client = self.checkout(key, factory)
+        try:
+            yield client
+        except BaseException:
+            client.close()
+            raise
+        self.release(key, client)
+
+    def close_all(self) -> None:
+        """Close every idle client."""
+        with self._lock:
+            clients = [client for idle in self._idle.values() for client in idle]
+            self._idle.clear()
+        for client in clients:
+            client.close()
+
+
+def _is_alive(client: paramiko.SSHClient) -> bool:
+    transport = client.get_transport()
+    return transport is not None and transport.is_active()
+
+
+# Shared by all SSHClient instances in the process
+default_pool = SSHConnectionPool()